@@ -0,0 +1,185 @@
+import random
+import struct
+
+from engine import GameSession
+from telemetry import NULL_TELEMETRY
+
+# Word ratings run linearly with a word's rank in the corpus difficulty index,
+# from RATING_FLOOR (easiest) to RATING_FLOOR + RATING_SPAN (hardest).
+RATING_FLOOR = 800.0
+RATING_SPAN = 1200.0
+DEFAULT_RATING = 1200.0
+
+PLAYER_K = 32.0
+WORD_K = 8.0
+
+# Aim slightly below the player's rating so they solve roughly 60% of words.
+TARGET_OFFSET = -70.0
+
+# The adaptive round plays like medium, but time and points follow each
+# word's rating across the easy..hard range.
+ADAPTIVE_LEVEL = {'word_count': 15, 'min_time_limit': 30, 'max_time_limit': 60,
+                  'min_points': 10, 'max_points': 30}
+
+# Value layouts of the dbm file ratings used to be kept in.
+PLAYER_RECORD = struct.Struct('<dI')
+WORD_RECORD = struct.Struct('<d')
+
+
+def expected_score(player_rating, word_rating):
+    return 1.0 / (1.0 + 10 ** ((word_rating - player_rating) / 400.0))
+
+
+def answer_outcome(verdict, time_limit):
+    # A solve counts 0.6..1.0 depending on how much time was left; a miss or
+    # timeout counts 0.
+    if not verdict.correct:
+        return 0.0
+    return 0.6 + 0.4 * max(0.0, 1.0 - verdict.elapsed / time_limit)
+
+
+class RatingStore:
+    # Player ratings and per-word rating adjustments in an SQLite database in
+    # WAL mode, so any number of game processes can read and write it side
+    # by side. Every update is its own transaction and is on disk before the
+    # next answer; word adjustments are added in SQL rather than read and
+    # written back, so concurrent rounds never undo each other. Nothing is
+    # opened until a rating is needed.
+    #
+    # `legacy_path` names the dbm file earlier versions kept ratings in; it
+    # is imported the first time the database is created.
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self._db = None
+
+    @property
+    def db(self):
+        if self._db is None:
+            import sqlite3
+
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                created = db.execute("SELECT name FROM sqlite_master WHERE name = 'players'").fetchone() is None
+                if created:
+                    db.execute("CREATE TABLE players (name TEXT PRIMARY KEY, rating REAL NOT NULL, "
+                               "games INTEGER NOT NULL)")
+                    db.execute("CREATE TABLE words (word TEXT PRIMARY KEY, adjustment REAL NOT NULL)")
+                    if self.legacy_path:
+                        self._import_legacy(db)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                db.close()
+                raise
+            self._db = db
+        return self._db
+
+    def _import_legacy(self, db):
+        import dbm
+
+        try:
+            legacy = dbm.open(self.legacy_path, 'r')
+        except dbm.error:
+            return
+        with legacy:
+            for key in legacy.keys():
+                kind, _, name = key.decode('utf-8').partition(':')
+                if kind == 'p':
+                    db.execute("INSERT INTO players VALUES (?, ?, ?)", (name,) + PLAYER_RECORD.unpack(legacy[key]))
+                elif kind == 'w':
+                    db.execute("INSERT INTO words VALUES (?, ?)", (name,) + WORD_RECORD.unpack(legacy[key]))
+
+    def player(self, name):
+        row = self.db.execute("SELECT rating, games FROM players WHERE name = ?", (name,)).fetchone()
+        return (DEFAULT_RATING, 0) if row is None else row
+
+    def set_player(self, name, rating, games):
+        self.db.execute("INSERT OR REPLACE INTO players VALUES (?, ?, ?)", (name, rating, games))
+
+    def word_adjustment(self, word):
+        row = self.db.execute("SELECT adjustment FROM words WHERE word = ?", (word,)).fetchone()
+        return 0.0 if row is None else row[0]
+
+    def adjust_word(self, word, delta):
+        self.db.execute("INSERT INTO words VALUES (?, ?) "
+                        "ON CONFLICT (word) DO UPDATE SET adjustment = adjustment + excluded.adjustment",
+                        (word, delta))
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class AdaptiveSession(GameSession):
+    # Picks each next word from the difficulty index near the player's
+    # current rating and updates player and word ratings Elo-style after
+    # every answer. Picking is O(1): the index is already sorted by
+    # difficulty, so a target rating maps straight to a rank window. Word
+    # adjustments learned from play refine expected scores but do not
+    # reorder the index.
+    __slots__ = ('ratings', 'player', 'rating', 'games', 'start_rating', 'used', 'word_ratings')
+
+    def __init__(self, corpus, ratings, player, level=ADAPTIVE_LEVEL, rng=random, telemetry=NULL_TELEMETRY):
+        super().__init__(corpus, level, words=[], rng=rng, telemetry=telemetry)
+        self.ratings = ratings
+        self.player = player
+        self.rating, self.games = ratings.player(player)
+        self.start_rating = self.rating
+        self.used = set()
+        self.word_ratings = {}
+
+    @property
+    def total(self):
+        return self.level['word_count']
+
+    def choose_word(self):
+        if self.position < len(self.words):
+            return self.words[self.position]
+
+        order = self.corpus.difficulty.order
+        count = len(order)
+        target = (self.rating + TARGET_OFFSET - RATING_FLOOR) / RATING_SPAN
+        center = min(count - 1, max(0, int(target * count)))
+        window = max(self.total, count // 100)
+        start = max(0, min(center - window // 2, count - window))
+        end = min(count, start + window)
+
+        for _ in range(20):
+            position = self.rng.randrange(start, end)
+            word = self.corpus[order[position]]
+            if word not in self.used:
+                break
+        self.used.add(word)
+        self.word_ratings[word] = RATING_FLOOR + RATING_SPAN * position / max(1, count - 1)
+        self.words.append(word)
+        return word
+
+    def limits(self, word):
+        # Fraction of the rating range this word sits at, 0 (easy) .. 1 (hard).
+        hardness = (self.word_ratings[word] - RATING_FLOOR) / RATING_SPAN
+        level = self.level
+        time_limit = round(level['max_time_limit'] - hardness * (level['max_time_limit'] - level['min_time_limit']))
+        points = round(level['min_points'] + hardness * (level['max_points'] - level['min_points']))
+        return time_limit, points
+
+    def submit(self, answer, elapsed):
+        puzzle = self.next_puzzle()
+        verdict = super().submit(answer, elapsed)
+
+        word_rating = self.word_ratings[puzzle.word] + self.ratings.word_adjustment(puzzle.word)
+        surprise = answer_outcome(verdict, puzzle.time_limit) - expected_score(self.rating, word_rating)
+        self.rating += PLAYER_K * surprise
+        self.ratings.adjust_word(puzzle.word, -WORD_K * surprise)
+        if self.finished:
+            self.games += 1
+        self.ratings.set_player(self.player, self.rating, self.games)
+        return verdict
+
+    @property
+    def rating_change(self):
+        return round(self.rating) - round(self.start_rating)
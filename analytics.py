@@ -0,0 +1,167 @@
+import argparse
+import csv
+import heapq
+import json
+import sys
+
+from scores import ALL_BOARD
+
+# Every command below makes a single pass over the score log through
+# generators; memory is bounded by the size of the answer (histogram buckets,
+# days x N), never by the number of entries.
+
+FIELDS = ('name', 'score', 'difficulty', 'date')
+
+
+# Lines are decoded a chunk at a time as one JSON array, which avoids most of
+# the per-call overhead of json.loads.
+READ_CHUNK_BYTES = 1 << 20
+
+
+def read_scores(path):
+    with open(path, 'rb') as log:
+        while True:
+            lines = log.readlines(READ_CHUNK_BYTES)
+            if not lines:
+                return
+            if not lines[-1].endswith(b'\n'):
+                # An append in progress (or a torn write) at the end.
+                lines.pop()
+            try:
+                yield from json.loads(b'[' + b','.join(lines) + b']')
+            except ValueError:
+                for line in lines:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+
+def filter_scores(entries, name=None, difficulty=None, since=None, until=None):
+    for entry in entries:
+        if name is not None and entry['name'] != name:
+            continue
+        if difficulty not in (None, ALL_BOARD) and entry['difficulty'] != difficulty:
+            continue
+        if since is not None and entry['date'][:10] < since:
+            continue
+        if until is not None and entry['date'][:10] > until:
+            continue
+        yield entry
+
+
+def percentile_rank(entries, score):
+    below = equal = total = 0
+    for entry in entries:
+        total += 1
+        if entry['score'] < score:
+            below += 1
+        elif entry['score'] == score:
+            equal += 1
+    if not total:
+        return 0.0, 0
+    return 100.0 * (below + 0.5 * equal) / total, total
+
+
+def histograms(entries, bucket_size):
+    counts = {}
+    for entry in entries:
+        board = counts.setdefault(entry['difficulty'], {})
+        bucket = entry['score'] // bucket_size
+        board[bucket] = board.get(bucket, 0) + 1
+    return counts
+
+
+def daily_top(entries, top_n):
+    days = {}
+    for seq, entry in enumerate(entries):
+        heap = days.setdefault(entry['date'][:10], [])
+        item = (entry['score'], -seq, entry)
+        if len(heap) < top_n:
+            heapq.heappush(heap, item)
+        elif item[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, item)
+    for day in sorted(days):
+        yield day, [item[2] for item in sorted(days[day], key=lambda item: item[:2], reverse=True)]
+
+
+def export(entries, output, fmt):
+    count = 0
+    if fmt == 'csv':
+        writer = csv.DictWriter(output, fieldnames=FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for entry in entries:
+            writer.writerow(entry)
+            count += 1
+    else:
+        for entry in entries:
+            output.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analytics over the Word Scramble score history")
+    parser.add_argument('--log', default="word_scramble_scores.jsonl", help="score log written by the game/server")
+    parser.add_argument('--difficulty', help="only consider one difficulty")
+    parser.add_argument('--since', metavar='YYYY-MM-DD')
+    parser.add_argument('--until', metavar='YYYY-MM-DD')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rank_parser = commands.add_parser('rank', help="percentile rank of a score")
+    rank_parser.add_argument('score', type=int)
+
+    history_parser = commands.add_parser('history', help="every result of one player")
+    history_parser.add_argument('name')
+
+    histogram_parser = commands.add_parser('histogram', help="score histogram per difficulty")
+    histogram_parser.add_argument('--bucket', type=int, default=50)
+
+    daily_parser = commands.add_parser('daily-top', help="top N results of each day")
+    daily_parser.add_argument('-n', type=int, default=10)
+
+    export_parser = commands.add_parser('export', help="export (filtered) results")
+    export_parser.add_argument('--format', choices=('csv', 'jsonl'), default='csv')
+    export_parser.add_argument('--output', help="output file (default stdout)")
+    export_parser.add_argument('--name', help="only this player")
+
+    args = parser.parse_args(argv)
+    name = getattr(args, 'name', None)
+    entries = filter_scores(read_scores(args.log), name, args.difficulty, args.since, args.until)
+
+    if args.command == 'rank':
+        rank, total = percentile_rank(entries, args.score)
+        print(f"A score of {args.score} is better than {rank:.2f}% of {total:,} results")
+    elif args.command == 'history':
+        games = best = 0
+        for entry in entries:
+            games += 1
+            best = max(best, entry['score'])
+            print(f"{entry['date']:<17} {entry['difficulty']:<10} {entry['score']:>6}")
+        print(f"{games:,} games, best {best}")
+    elif args.command == 'histogram':
+        for difficulty, buckets in sorted(histograms(entries, args.bucket).items()):
+            total = sum(buckets.values())
+            peak = max(buckets.values())
+            print(f"{difficulty.upper()} ({total:,} results)")
+            for bucket in range(min(buckets), max(buckets) + 1):
+                count = buckets.get(bucket, 0)
+                print(f"  {bucket * args.bucket:>6}-{(bucket + 1) * args.bucket - 1:<6} {count:>10,} "
+                      f"{'#' * round(count / peak * 40)}")
+    elif args.command == 'daily-top':
+        for day, top in daily_top(entries, args.n):
+            print(day)
+            for rank, entry in enumerate(top, 1):
+                print(f"  {rank:>3}. {entry['name']:<15} {entry['score']:>6} {entry['difficulty']}")
+    elif args.command == 'export':
+        output = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+        try:
+            count = export(entries, output, args.format)
+        finally:
+            if args.output:
+                output.close()
+        print(f"Exported {count:,} results", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,731 @@
+import argparse
+import datetime
+import json
+import os
+import random
+import resource
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import unicodedata
+
+import analytics
+import daily
+from blitz import BLITZ_LEVEL, BlitzSession
+from corpus import WordCorpus, graphemes, load_corpus
+from difficulty import DifficultyIndex
+from engine import GameSession, scramble_word
+from puzzles import HAS_NUMPY, PuzzlePool, batch_scramble
+from render import display_width
+from replay import ReplayRecorder, new_seed, verify_files
+from scores import ALL_BOARD, ScoreStore
+from simulate import ModeledSolver
+from telemetry import NULL_TELEMETRY, RingBufferSink, Telemetry
+from tiers import compile_tier, compile_tiers, load_tiers, validate_tier
+
+
+def current_rss_mb():
+    try:
+        with open('/proc/self/statm') as file:
+            pages = int(file.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def write_synthetic_words(path, count, seed=0):
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase
+    with open(path, 'w') as file:
+        for _ in range(count):
+            file.write(''.join(rng.choices(letters, k=rng.randint(3, 14))))
+            file.write('\n')
+
+
+def bench_corpus(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'words.txt')
+        write_synthetic_words(path, args.words)
+
+        rss_before = current_rss_mb()
+        start = time.perf_counter()
+        corpus = WordCorpus.from_file(path)
+        load_time = time.perf_counter() - start
+        rss_after = current_rss_mb()
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        corpus.sample(20, 9)
+    sample_time = (time.perf_counter() - start) / args.rounds
+
+    print(f"words loaded:      {len(corpus):,}")
+    print(f"load time:         {load_time:.2f} s")
+    print(f"resident memory:   {rss_after - rss_before:.1f} MB retained, {peak_rss_mb():.1f} MB peak")
+    print(f"20-word sample:    {sample_time * 1e6:.1f} us")
+
+
+def bench_sessions(args):
+    corpus = load_corpus(args.word_file)
+    corpus.anagrams
+    levels = list(compile_tiers(load_tiers(), corpus).values())
+    rng = random.Random(0)
+    telemetry = Telemetry(RingBufferSink()) if args.telemetry else NULL_TELEMETRY
+
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    sessions = [GameSession(corpus, levels[i % len(levels)], rng=rng, telemetry=telemetry)
+                for i in range(args.sessions)]
+    create_time = time.perf_counter() - start
+    rss_after = current_rss_mb()
+
+    # Interleave the sessions the way a server would: one answer per
+    # session per pass until every round is finished.
+    answers = 0
+    start = time.perf_counter()
+    active = sessions
+    while active:
+        for session in active:
+            puzzle = session.next_puzzle()
+            answer = puzzle.word if rng.random() < 0.7 else puzzle.scrambled
+            session.submit(answer, rng.uniform(0, puzzle.time_limit))
+            answers += 1
+        active = [session for session in active if not session.finished]
+    play_time = time.perf_counter() - start
+
+    print(f"sessions:          {args.sessions:,}")
+    print(f"create:            {create_time:.3f} s ({args.sessions / create_time:,.0f} sessions/s)")
+    print(f"memory:            {(rss_after - rss_before) * 1024 / args.sessions:.2f} KB per session")
+    print(f"play:              {answers:,} answers in {play_time:.3f} s ({answers / play_time:,.0f} answers/s)")
+
+
+IDLE_INPUT_CHILD = """
+import sys, time
+from game_gui import input_with_timeout
+wall, cpu = time.perf_counter(), time.process_time()
+answer = input_with_timeout('> ', float(sys.argv[1]))
+print(answer, time.perf_counter() - wall, time.process_time() - cpu, file=sys.stderr)
+"""
+
+
+def bench_idle_input(args):
+    import pty
+
+    # A pseudo-terminal gives the child a real tty on stdin that nobody
+    # types into, which is exactly the idle-player case.
+    master, slave = pty.openpty()
+    try:
+        child = subprocess.run([sys.executable, '-c', IDLE_INPUT_CHILD, str(args.seconds)],
+                               stdin=slave, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                               cwd=os.path.dirname(os.path.abspath(__file__)), text=True,
+                               timeout=args.seconds + 30)
+    finally:
+        os.close(master)
+        os.close(slave)
+
+    answer, wall, cpu = child.stderr.split()[-3:]
+    wall, cpu = float(wall), float(cpu)
+    print(f"result:            {answer}")
+    print(f"wall time:         {wall:.3f} s (deadline overshoot {(wall - args.seconds) * 1000:.1f} ms)")
+    print(f"cpu time:          {cpu * 1000:.2f} ms ({cpu / wall * 100:.4f}% of one core)")
+    if answer != 'None' or cpu > args.max_cpu:
+        sys.exit(f"FAIL: expected a timeout using at most {args.max_cpu:.3f} s of CPU")
+
+
+def score_stress_worker(path, worker, records, batch):
+    store = ScoreStore(path)
+    rng = random.Random(worker)
+    difficulties = list(load_tiers())
+    for first in range(0, records, batch):
+        store.record_many([
+            {'name': f"w{worker}", 'score': rng.randint(0, 1000), 'difficulty': rng.choice(difficulties),
+             'date': str(i)}
+            for i in range(first, min(records, first + batch))
+        ])
+
+
+def bench_score_stress(args):
+    from multiprocessing import Pool
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'scores.jsonl')
+        # Simulate a writer that crashed halfway through an append.
+        with open(path, 'wb') as log:
+            log.write(b'{"name":"crashed","sco')
+
+        start = time.perf_counter()
+        with Pool(args.processes) as pool:
+            pool.starmap(score_stress_worker,
+                         [(path, worker, args.records, args.batch) for worker in range(args.processes)])
+        duration = time.perf_counter() - start
+
+        store = ScoreStore(path)
+        seen = set()
+        all_scores = []
+        with open(path, 'rb') as log:
+            for line in log:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                seen.add((entry['name'], entry['date']))
+                all_scores.append(entry['score'])
+
+    expected = args.processes * args.records
+    all_scores.sort(reverse=True)
+    top_ok = [entry['score'] for entry in store.top(ALL_BOARD)] == all_scores[:store.top_k]
+    print(f"writers:           {args.processes} processes x {args.records:,} results (batch {args.batch})")
+    print(f"throughput:        {expected / duration:,.0f} results/s")
+    print(f"entries in log:    {store.entries:,} of {expected:,} expected, {len(seen):,} unique, "
+          f"{store.skipped_lines} torn line(s) skipped")
+    print(f"top-{store.top_k} matches log: {top_ok}")
+    if store.entries != expected or len(seen) != expected or not top_ok:
+        sys.exit("FAIL: score updates were lost or duplicated")
+
+
+def time_to_prompt(extra_args, prompt=b"Enter your name"):
+    start = time.perf_counter()
+    game = subprocess.Popen([sys.executable, 'game_gui.py'] + extra_args,
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    output = b''
+    while prompt not in output:
+        chunk = os.read(game.stdout.fileno(), 65536)
+        if not chunk:
+            break
+        output += chunk
+    elapsed = time.perf_counter() - start
+    game.kill()
+    game.wait()
+    return elapsed
+
+
+def bench_first_prompt(args):
+    # The whole launch, interpreter start to prompt: imports, the tiers file,
+    # the corpus and its difficulty index (from the cache after the first
+    # run). The budget applies to --fast, which has no cosmetic pauses.
+    word_file = [args.word_file] if args.word_file else []
+    for label, extra_args in (("default", []), ("--fast", ['--fast'])):
+        timings = sorted(time_to_prompt(extra_args + word_file) for _ in range(args.runs))
+        median = timings[len(timings) // 2] * 1000
+        print(f"{label + ':':<19}{median:.1f} ms to first prompt (median of {args.runs})")
+    if median > args.budget:
+        sys.exit(f"FAIL: --fast took {median:.1f} ms to the first prompt, budget is {args.budget:.1f} ms")
+
+
+STARTUP_CHILD = """
+import sys
+import time
+start = time.perf_counter()
+import game_gui
+imported = time.perf_counter()
+# As launching the game does: the tiers are compiled, which loads the corpus
+# and its difficulty index.
+game_gui.WordScrambleGame().compiled_tiers
+created = time.perf_counter()
+for _ in range(999):
+    game_gui.WordScrambleGame()
+print(imported - start, created - imported, (time.perf_counter() - created) / 999, file=sys.stderr)
+"""
+
+
+def bench_startup(args):
+    # Runs with bytecode caching on (as an installed game would) after one
+    # warm-up run, so the numbers are import and construction cost rather
+    # than compilation.
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    cwd = os.path.dirname(os.path.abspath(__file__))
+
+    def run(*extra):
+        return subprocess.run([sys.executable] + list(extra) + ['-c', STARTUP_CHILD], cwd=cwd, env=env,
+                              stderr=subprocess.PIPE, text=True, check=True).stderr
+
+    run()
+    timings = sorted(tuple(map(float, run().split()[-3:])) for _ in range(args.runs))
+    imported, first, later = timings[len(timings) // 2]
+    print(f"import game_gui:   {imported * 1000:.1f} ms (median of {args.runs})")
+    print(f"first game:        {first * 1000:.2f} ms (tiers compiled)")
+    print(f"later games:       {later * 1e6:.1f} us each (corpus and assets are shared)")
+
+    modules = []
+    for line in run('-X', 'importtime').splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line.split('|')
+            if cumulative.strip().isdigit():
+                modules.append((int(cumulative), name.strip()))
+    print("slowest imports (cumulative):")
+    for cumulative, name in sorted(modules, reverse=True)[:args.top]:
+        print(f"  {name:<24}{cumulative / 1000:>8.1f} ms")
+
+    total = (imported + first) * 1000
+    if total > args.budget:
+        sys.exit(f"FAIL: import and first game took {total:.1f} ms, budget is {args.budget:.1f} ms")
+
+
+def bench_replay(args):
+    # Records seeded games played by a simulated solver, inflates the score
+    # of every --tamper-every'th one, and checks that bulk verification flags
+    # exactly those.
+    corpus = load_corpus(args.word_file)
+    levels = compile_tiers(load_tiers(), corpus)
+    solver = ModeledSolver()
+    rng = random.Random(0)
+    tampered = 0
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'replays.bin')
+        start = time.perf_counter()
+        with open(path, 'wb') as file:
+            for game in range(args.games):
+                difficulty = rng.choice(list(levels))
+                seed = new_seed()
+                session = GameSession(corpus, levels[difficulty], rng=random.Random(seed))
+                recorder = ReplayRecorder(corpus, difficulty, levels[difficulty], seed)
+                while not session.finished:
+                    puzzle = session.next_puzzle()
+                    while rng.random() < args.hint_rate and session.next_hint():
+                        session.use_hint(session.next_hint())
+                    answer, elapsed = solver.answer(puzzle, rng)
+                    elapsed_ms = round(elapsed * 1000)
+                    hints = session.hints_used
+                    session.submit(answer, elapsed_ms / 1000)
+                    recorder.add(puzzle.word, answer, elapsed_ms, hints)
+                score = session.score
+                if args.tamper_every and game % args.tamper_every == 0:
+                    score += 10
+                    tampered += 1
+                file.write(recorder.encode(score))
+        recorded = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        checked, failures = verify_files([path], args.word_file, args.workers)[path]
+        verified = time.perf_counter() - start
+
+    print(f"record:            {args.games:,} games in {recorded:.2f} s, {size / args.games:.0f} bytes per game")
+    print(f"verify:            {checked:,} games in {verified:.2f} s ({checked / verified:,.0f} games/s)")
+    print(f"flagged:           {len(failures):,} of {tampered:,} tampered games")
+    if checked != args.games or len(failures) != tampered:
+        sys.exit("FAIL: verification did not flag exactly the tampered games")
+
+
+def bench_blitz(args):
+    # Time from submitting an answer to having the next word's frame ready,
+    # with the prefetch thread versus scrambling and rendering on demand. The
+    # pause between words stands in for the player reading and typing.
+    corpus = load_corpus(args.word_file)
+    corpus.difficulty
+
+    def render(word, scrambled):
+        return f"[{scrambled.upper():^{display_width(scrambled) + 4}}]"
+
+    session = BlitzSession(corpus, render=render)
+    session.start()
+    prefetched = []
+    for _ in range(args.words):
+        time.sleep(args.think)
+        start = time.perf_counter()
+        puzzle = session.next_puzzle()
+        session.frame
+        prefetched.append(time.perf_counter() - start)
+        session.prefetch()
+        session.submit(puzzle.word, 1.0)
+    session.close()
+
+    rng = random.Random(0)
+    on_demand = []
+    for _ in range(args.words):
+        time.sleep(args.think)
+        start = time.perf_counter()
+        word = corpus.difficulty.sample(1, BLITZ_LEVEL['min_score'], BLITZ_LEVEL['max_score'], rng)[0]
+        render(word, scramble_word(word, corpus, rng))
+        on_demand.append(time.perf_counter() - start)
+
+    print(f"prefetch misses:   {session.prefetcher.misses}")
+    for label, timings in (("prefetched:", prefetched), ("on demand:", on_demand)):
+        timings.sort()
+        print(f"{label:<19}p50 {timings[len(timings) // 2] * 1e6:8.1f} us   "
+              f"p99 {timings[int(len(timings) * 0.99)] * 1e6:8.1f} us")
+
+
+def bench_daily(args):
+    # Generating today's set (including the corpus indexes it needs) versus
+    # loading it from the cache file, many threads asking for it at once, and
+    # the daily board's incremental standings against a full recount.
+    from concurrent.futures import ThreadPoolExecutor
+
+    day = datetime.date.today()
+    with tempfile.TemporaryDirectory() as tmp:
+        words_path = os.path.join(tmp, 'words.txt')
+        cache_path = os.path.join(tmp, 'daily.bin')
+        write_synthetic_words(words_path, args.corpus_words)
+
+        corpus = WordCorpus.from_file(words_path)
+        start = time.perf_counter()
+        generated = daily.daily_challenge(corpus, day, cache_path)
+        generate_time = time.perf_counter() - start
+        size = os.path.getsize(cache_path)
+
+        # A fresh process: new corpus object, nothing in memory.
+        daily._challenges.clear()
+        corpus = WordCorpus.from_file(words_path)
+        start = time.perf_counter()
+        loaded = daily.daily_challenge(corpus, day, cache_path)
+        load_time = time.perf_counter() - start
+
+        daily._challenges.clear()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            served = list(pool.map(lambda _: daily.daily_challenge(corpus, day, cache_path), range(args.players)))
+        serve_time = time.perf_counter() - start
+        distinct = len({id(challenge) for challenge in served})
+
+        store = ScoreStore(os.path.join(tmp, 'scores.jsonl'))
+        board = daily.daily_board(day)
+        rng = random.Random(0)
+        results = [{'name': f"p{rng.randrange(args.players)}", 'score': rng.randrange(500), 'difficulty': 'daily',
+                    'date': f"{day.isoformat()} 12:00", 'board': board} for _ in range(args.results)]
+        start = time.perf_counter()
+        for batch in range(0, len(results), 100):
+            store.record_many(results[batch:batch + 100])
+        record_time = time.perf_counter() - start
+
+        bests = {}
+        for entry in results:
+            bests[entry['name']] = max(entry['score'], bests.get(entry['name'], -1))
+        names = rng.sample(sorted(bests), min(200, len(bests)))
+        start = time.perf_counter()
+        ranks = [store.player_rank(name, board) for name in names]
+        rank_time = (time.perf_counter() - start) / len(names)
+        ranks_ok = ranks == [1 + sum(best > bests[name] for best in bests.values()) for name in names]
+
+    same = generated == loaded and all(challenge == generated for challenge in served)
+    print(f"generate:          {generate_time * 1000:.1f} ms ({len(generated.words)} words, {size} byte cache file)")
+    print(f"load from cache:   {load_time * 1000:.2f} ms")
+    print(f"serve:             {args.players:,} players on {args.threads} threads in {serve_time * 1000:.1f} ms, "
+          f"{distinct} set(s) built")
+    print(f"record:            {args.results:,} results in {record_time:.2f} s, {store.players(board):,} players")
+    print(f"standing:          {rank_time * 1e6:.1f} us per lookup, matches recount: {ranks_ok}")
+    if not same or distinct != 1:
+        sys.exit("FAIL: players were not all served the same daily set")
+    if not ranks_ok:
+        sys.exit("FAIL: daily standings disagree with a full recount")
+
+
+BENCH_TIERS = (
+    {'name': 'band', 'word_count': 20, 'time_limit': 30, 'points': 20, 'difficulty': [30, 60]},
+    {'name': 'sprint', 'word_count': 20, 'time_limit': 5, 'points': 15, 'length': [3, 5]},
+    {'name': 'both', 'word_count': 20, 'time_limit': 20, 'points': 25, 'difficulty': [60, 100], 'length': [8, 10]},
+)
+
+
+def bench_tiers(args):
+    # One-time compile cost per tier, then drawing a round from the compiled
+    # selection versus filtering the band every round.
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'words.txt')
+        write_synthetic_words(path, args.words)
+        corpus = WordCorpus.from_file(path)
+        start = time.perf_counter()
+        corpus.difficulty
+        print(f"difficulty index:  {time.perf_counter() - start:.2f} s for {len(corpus):,} words")
+
+    rng = random.Random(0)
+    wrong = 0
+    for raw in BENCH_TIERS:
+        name, tier = validate_tier(raw, 'benchmark')
+        start = time.perf_counter()
+        selection = compile_tier(corpus, name, tier)['selection']
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            words = selection.sample(tier['word_count'], rng)
+        compiled = (time.perf_counter() - start) / args.rounds
+
+        def in_band(word):
+            return tier.get('min_length', 0) <= len(word) <= tier.get('max_length', len(word))
+
+        band = corpus.difficulty.order[slice(*corpus.difficulty.position_range(tier['min_score'], tier['max_score']))]
+        start = time.perf_counter()
+        for _ in range(args.filtered_rounds):
+            candidates = [index for index in band if in_band(corpus[index])]
+            [corpus[index] for index in rng.sample(candidates, tier['word_count'])]
+        filtered = (time.perf_counter() - start) / args.filtered_rounds
+
+        members = {corpus[index] for index in band}
+        wrong += sum(1 for word in words if word not in members or not in_band(word))
+        print(f"{name + ':':<19}compile {compile_time * 1000:7.1f} ms, {selection.size:>9,} words   "
+              f"round {compiled * 1e6:8.1f} us compiled, {filtered * 1e3:8.2f} ms filtered each round")
+    if wrong:
+        sys.exit(f"FAIL: {wrong} sampled word(s) fall outside their tier's bands")
+
+
+def bench_scramble(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'words.txt')
+        write_synthetic_words(path, args.corpus_words)
+        corpus = WordCorpus.from_file(path)
+    corpus.anagrams
+    rng = random.Random(0)
+    words = corpus.sample(min(args.words, len(corpus)), rng=rng)
+
+    start = time.perf_counter()
+    for word in words:
+        scramble_word(word, corpus, rng)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_scramble(words, corpus, rng)
+    batch_time = time.perf_counter() - start
+
+    levels = compile_tiers(load_tiers(), corpus)
+    level = levels.get('medium') or next(iter(levels.values()))
+    pool = PuzzlePool(corpus, level, size=args.words)
+    start = time.perf_counter()
+    pool.refill()
+    refill_time = time.perf_counter() - start
+    start = time.perf_counter()
+    served = len(pool) // 2
+    for _ in range(served):
+        pool.get()
+    get_time = (time.perf_counter() - start) / served
+
+    print(f"words:             {len(words):,} (numpy {'available' if HAS_NUMPY else 'not installed'})")
+    print(f"per-word loop:     {loop_time:.3f} s ({len(words) / loop_time:,.0f} words/s)")
+    print(f"batch_scramble:    {batch_time:.3f} s ({len(words) / batch_time:,.0f} words/s, "
+          f"{loop_time / batch_time:.1f}x)")
+    print(f"pool refill:       {refill_time:.3f} s for {args.words:,} puzzles")
+    print(f"pool get:          {get_time * 1e6:.2f} us per puzzle, {pool.misses} misses")
+
+
+def bench_difficulty(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'words.txt')
+        write_synthetic_words(path, args.words)
+        corpus = WordCorpus.from_file(path)
+
+        start = time.perf_counter()
+        corpus.anagrams
+        anagram_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = DifficultyIndex.build(corpus)
+        build_time = time.perf_counter() - start
+
+        cache_path = path + '.difficulty'
+        index.save(cache_path)
+        start = time.perf_counter()
+        DifficultyIndex.load(cache_path, corpus)
+        load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        index.sample(20, 60, 100)
+    sample_time = (time.perf_counter() - start) / args.rounds
+
+    print(f"words:             {len(corpus):,}")
+    print(f"anagram index:     {anagram_time:.2f} s")
+    print(f"difficulty build:  {build_time:.2f} s ({len(corpus) / build_time:,.0f} words/s)")
+    print(f"cached load:       {load_time * 1000:.1f} ms")
+    print(f"20-word band draw: {sample_time * 1e6:.1f} us")
+
+
+# Letter sets for synthetic mixed-script dictionaries. Devanagari words get
+# a vowel sign (a combining mark) after some consonants, and a share of the
+# Latin words is written decomposed, as some keyboards and files deliver it.
+SCRIPTS = {
+    'latin': string.ascii_lowercase + 'áéíóúàèâêîôûäöüñçß',
+    'greek': 'αβγδεζηθικλμνξοπρστυφχψω',
+    'cyrillic': 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя',
+    'devanagari': 'कखगघचछजझटठडढणतथदधनपफबभमयरलवशषसह',
+    'cjk': ''.join(map(chr, range(0x4e00, 0x4e00 + 500))),
+    'hangul': ''.join(map(chr, range(0xac00, 0xac00 + 500))),
+}
+VOWEL_SIGNS = 'ािीुूेैोौ'
+
+
+def synthetic_word(rng, script):
+    letters = rng.choices(SCRIPTS[script], k=rng.randint(2, 6) if script in ('cjk', 'hangul') else rng.randint(3, 12))
+    if script == 'devanagari':
+        letters = [letter + rng.choice(VOWEL_SIGNS) if rng.random() < 0.4 else letter for letter in letters]
+    word = ''.join(letters)
+    if script == 'latin' and rng.random() < 0.3:
+        word = unicodedata.normalize('NFD', word)
+    return word
+
+
+def bench_unicode(args):
+    rng = random.Random(0)
+    dictionaries = {
+        'ascii': [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 12))) for _ in range(args.words)],
+        'mixed': [synthetic_word(rng, rng.choice(list(SCRIPTS))) for _ in range(args.words)],
+    }
+    failures = 0
+    for label, words in dictionaries.items():
+        start = time.perf_counter()
+        corpus = WordCorpus(words)
+        corpus.anagrams
+        load_time = time.perf_counter() - start
+
+        sample = [corpus[i] for i in rng.sample(range(len(corpus)), min(args.checks, len(corpus)))]
+        start = time.perf_counter()
+        scrambles = [scramble_word(word, corpus, rng) for word in sample]
+        scramble_time = time.perf_counter() - start
+        failures += sum(sorted(graphemes(scrambled)) != sorted(graphemes(word))
+                        for word, scrambled in zip(sample, scrambles))
+
+        # Answers as a player might type them: upper case and decomposed.
+        answers = [unicodedata.normalize('NFD', word.upper()) for word in sample]
+        is_anagram = corpus.anagrams.is_anagram
+        start = time.perf_counter()
+        matched = sum(is_anagram(answer, word) for answer, word in zip(answers, sample))
+        check_time = time.perf_counter() - start
+        failures += len(sample) - matched
+
+        start = time.perf_counter()
+        for word in scrambles:
+            display_width(word.upper())
+        width_time = time.perf_counter() - start
+
+        print(f"{label.upper()} ({len(corpus):,} words)")
+        print(f"  load + anagram index: {load_time:.2f} s ({len(words) / load_time:,.0f} words/s)")
+        print(f"  scramble:             {len(sample) / scramble_time:,.0f} words/s")
+        print(f"  answer check:         {len(sample) / check_time:,.0f} answers/s ({matched:,}/{len(sample):,} matched)")
+        print(f"  display width:        {len(sample) / width_time:,.0f} words/s")
+    if failures:
+        sys.exit(f"FAIL: {failures} scrambles split a letter or answers failed to match")
+
+
+def write_synthetic_scores(path, count, seed=0):
+    rng = random.Random(seed)
+    difficulties = list(load_tiers())
+    with open(path, 'w') as file:
+        for i in range(count):
+            day = 1 + i * 28 // count
+            file.write(f'{{"name":"p{rng.randrange(100_000)}","score":{rng.randrange(700)},'
+                       f'"difficulty":"{difficulties[i % len(difficulties)]}","date":"2026-02-{day:02d} 12:00"}}\n')
+
+
+def bench_analytics(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'scores.jsonl')
+        start = time.perf_counter()
+        write_synthetic_scores(path, args.entries)
+        print(f"generated:         {args.entries:,} entries ({os.path.getsize(path) / 2**20:,.0f} MB) "
+              f"in {time.perf_counter() - start:.1f} s")
+
+        passes = (
+            ('rank', lambda entries: analytics.percentile_rank(entries, 500)),
+            ('history', lambda entries: sum(1 for _ in analytics.filter_scores(entries, name='p42'))),
+            ('histogram', lambda entries: analytics.histograms(entries, 50)),
+            ('daily-top', lambda entries: list(analytics.daily_top(entries, 10))),
+            ('export csv', lambda entries: analytics.export(entries, open(os.devnull, 'w'), 'csv')),
+        )
+        rss_before = current_rss_mb()
+        for label, run in passes:
+            start = time.perf_counter()
+            run(analytics.read_scores(path))
+            duration = time.perf_counter() - start
+            print(f"{label + ':':<19}{duration:.1f} s ({args.entries / duration:,.0f} entries/s)")
+        print(f"memory growth:     {current_rss_mb() - rss_before:.1f} MB (peak RSS {peak_rss_mb():.0f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Word Scramble performance benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    corpus_parser = commands.add_parser('corpus', help="corpus load time and memory")
+    corpus_parser.add_argument('--words', type=int, default=1_000_000)
+    corpus_parser.add_argument('--rounds', type=int, default=10_000)
+    corpus_parser.set_defaults(func=bench_corpus)
+
+    sessions_parser = commands.add_parser('sessions', help="concurrent headless game sessions")
+    sessions_parser.add_argument('--sessions', type=int, default=10_000)
+    sessions_parser.add_argument('--word-file')
+    sessions_parser.add_argument('--telemetry', action='store_true', help="record events in a ring buffer")
+    sessions_parser.set_defaults(func=bench_sessions)
+
+    idle_parser = commands.add_parser('idle-input', help="CPU used while waiting for an answer")
+    idle_parser.add_argument('--seconds', type=float, default=60.0)
+    idle_parser.add_argument('--max-cpu', type=float, default=0.05, help="fail above this many CPU seconds")
+    idle_parser.set_defaults(func=bench_idle_input)
+
+    stress_parser = commands.add_parser('score-stress', help="concurrent writers on one score log")
+    stress_parser.add_argument('--processes', type=int, default=8)
+    stress_parser.add_argument('--records', type=int, default=500, help="results per process")
+    stress_parser.add_argument('--batch', type=int, default=1, help="results per group commit")
+    stress_parser.set_defaults(func=bench_score_stress)
+
+    prompt_parser = commands.add_parser('first-prompt', help="time from launch to the name prompt")
+    prompt_parser.add_argument('--runs', type=int, default=5)
+    prompt_parser.add_argument('--word-file', help="dictionary to launch the game with")
+    prompt_parser.add_argument('--budget', type=float, default=250.0,
+                               help="fail above this many ms (median, --fast) from launch to the prompt")
+    prompt_parser.set_defaults(func=bench_first_prompt)
+
+    startup_parser = commands.add_parser('startup', help="import and construction cost, against a budget")
+    startup_parser.add_argument('--runs', type=int, default=9)
+    startup_parser.add_argument('--top', type=int, default=8, help="number of slowest imports to list")
+    startup_parser.add_argument('--budget', type=float, default=50.0,
+                                help="fail above this many ms for import game_gui plus the first game")
+    startup_parser.set_defaults(func=bench_startup)
+
+    replay_parser = commands.add_parser('replay', help="record seeded games and re-verify them in bulk")
+    replay_parser.add_argument('--games', type=int, default=20_000)
+    replay_parser.add_argument('--tamper-every', type=int, default=100, help="inflate every Nth game's score")
+    replay_parser.add_argument('--hint-rate', type=float, default=0.2, help="chance of taking each next hint")
+    replay_parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    replay_parser.add_argument('--word-file')
+    replay_parser.set_defaults(func=bench_replay)
+
+    blitz_parser = commands.add_parser('blitz', help="next-word latency with and without prefetching")
+    blitz_parser.add_argument('--words', type=int, default=500)
+    blitz_parser.add_argument('--think', type=float, default=0.002, help="seconds between answers")
+    blitz_parser.add_argument('--word-file')
+    blitz_parser.set_defaults(func=bench_blitz)
+
+    daily_parser = commands.add_parser('daily', help="daily set generation, caching and standings")
+    daily_parser.add_argument('--corpus-words', type=int, default=200_000)
+    daily_parser.add_argument('--players', type=int, default=10_000)
+    daily_parser.add_argument('--threads', type=int, default=16)
+    daily_parser.add_argument('--results', type=int, default=50_000)
+    daily_parser.set_defaults(func=bench_daily)
+
+    tiers_parser = commands.add_parser('tiers', help="compiled tier selections vs per-round filtering")
+    tiers_parser.add_argument('--words', type=int, default=1_000_000)
+    tiers_parser.add_argument('--rounds', type=int, default=10_000)
+    tiers_parser.add_argument('--filtered-rounds', type=int, default=20)
+    tiers_parser.set_defaults(func=bench_tiers)
+
+    scramble_parser = commands.add_parser('scramble', help="per-word vs batch scrambling and the puzzle pool")
+    scramble_parser.add_argument('--words', type=int, default=100_000)
+    scramble_parser.add_argument('--corpus-words', type=int, default=200_000)
+    scramble_parser.set_defaults(func=bench_scramble)
+
+    difficulty_parser = commands.add_parser('difficulty', help="difficulty index build and band sampling")
+    difficulty_parser.add_argument('--words', type=int, default=1_000_000)
+    difficulty_parser.add_argument('--rounds', type=int, default=10_000)
+    difficulty_parser.set_defaults(func=bench_difficulty)
+
+    unicode_parser = commands.add_parser('unicode', help="ASCII vs mixed-script dictionaries")
+    unicode_parser.add_argument('--words', type=int, default=200_000)
+    unicode_parser.add_argument('--checks', type=int, default=50_000, help="words scrambled and answered")
+    unicode_parser.set_defaults(func=bench_unicode)
+
+    analytics_parser = commands.add_parser('analytics', help="streaming passes over a large score log")
+    analytics_parser.add_argument('--entries', type=int, default=10_000_000)
+    analytics_parser.set_defaults(func=bench_analytics)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
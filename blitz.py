@@ -0,0 +1,129 @@
+import random
+import threading
+import time
+from collections import deque
+
+from engine import GameSession, scramble_word
+from telemetry import NULL_TELEMETRY
+
+# One clock for the whole round instead of a limit per word. Each correct
+# word scores `points` plus the usual time bonus, measured against
+# `bonus_time` seconds.
+BLITZ_LEVEL = {'duration': 90, 'points': 10, 'bonus_time': 20, 'min_score': 10, 'max_score': 80}
+
+# Words drawn from the difficulty band per sample; words within a batch
+# are distinct.
+PREFETCH_BATCH = 50
+
+
+class Prefetcher:
+    # Keeps the next `depth` puzzles ready: the word, its scramble and
+    # whatever render(word, scrambled) returns (the game passes a function
+    # that builds the word's frame). Like PuzzlePool, taking a puzzle is a
+    # deque pop and a background thread tops the queue back up. The thread
+    # is only woken by refill_later(), which the game calls once the word is
+    # on screen: waking it costs a context switch, and that should happen
+    # while the player is thinking, not between an answer and the next word.
+    def __init__(self, corpus, level, rng=random, render=None, depth=4):
+        self.corpus = corpus
+        self.level = level
+        self.rng = rng
+        self.render = render
+        self.depth = depth
+        self.misses = 0
+        self._ready = deque()
+        self._words = deque()
+        self._lock = threading.Lock()
+        self._wanted = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._wanted.set()
+
+    def _run(self):
+        while True:
+            self._wanted.wait()
+            self._wanted.clear()
+            if self._closed:
+                return
+            self.fill()
+
+    def fill(self):
+        with self._lock:
+            while len(self._ready) < self.depth and not self._closed:
+                if not self._words:
+                    self._words.extend(self.corpus.difficulty.sample(
+                        PREFETCH_BATCH, self.level['min_score'], self.level['max_score'], self.rng))
+                word = self._words.popleft()
+                scrambled = scramble_word(word, self.corpus, self.rng)
+                frame = self.render(word, scrambled) if self.render is not None else None
+                self._ready.append((word, scrambled, frame))
+
+    def get(self):
+        try:
+            return self._ready.popleft()
+        except IndexError:
+            self.misses += 1
+            self.fill()
+            return self._ready.popleft()
+
+    def refill_later(self):
+        self._wanted.set()
+
+    def close(self):
+        self._closed = True
+        self._wanted.set()
+
+
+class BlitzSession(GameSession):
+    # As many words as the player can solve before the round clock runs out.
+    # The rng is only used by the prefetch thread once the session exists.
+    __slots__ = ('prefetcher', 'frames', 'clock', 'deadline')
+
+    def __init__(self, corpus, level=BLITZ_LEVEL, rng=random, telemetry=NULL_TELEMETRY, render=None,
+                 clock=time.monotonic):
+        super().__init__(corpus, level, words=[], rng=rng, scrambles=[], telemetry=telemetry)
+        self.prefetcher = Prefetcher(corpus, level, rng, render)
+        self.frames = []
+        self.clock = clock
+        self.deadline = None
+
+    def start(self):
+        self.deadline = self.clock() + self.level['duration']
+
+    @property
+    def remaining(self):
+        if self.deadline is None:
+            return self.level['duration']
+        return max(0.0, self.deadline - self.clock())
+
+    @property
+    def total(self):
+        return None
+
+    @property
+    def finished(self):
+        return self.deadline is not None and self.clock() >= self.deadline
+
+    def choose_word(self):
+        if self.position == len(self.words):
+            word, scrambled, frame = self.prefetcher.get()
+            self.words.append(word)
+            self.scrambles.append(scrambled)
+            self.frames.append(frame)
+        return self.words[self.position]
+
+    def limits(self, word):
+        # A word can be answered until the round clock runs out.
+        return self.remaining, self.level['points']
+
+    @property
+    def frame(self):
+        return self.frames[self.next_puzzle().number - 1]
+
+    def prefetch(self):
+        # Call while waiting for the player's answer.
+        self.prefetcher.refill_later()
+
+    def close(self):
+        self.prefetcher.close()
@@ -0,0 +1,273 @@
+import os
+import random
+import unicodedata
+import zlib
+from bisect import bisect_left, bisect_right
+
+from difficulty import DifficultyIndex
+
+try:
+    import regex
+    _GRAPHEME = regex.compile(r'\X')
+    HAS_REGEX = True
+except ImportError:
+    HAS_REGEX = False
+
+DEFAULT_WORDS = (
+    # Easy words (4-5 letters)
+    "cake", "game", "blue", "jump", "play", "talk", "walk", "fast", "swim", "read",
+    "sing", "time", "road", "hand", "feet", "desk", "book", "file", "door", "city",
+    # Medium words (6-8 letters)
+    "computer", "language", "internet", "victory", "journey", "student", "practice",
+    "mountain", "elephant", "universe", "chocolate", "keyboard", "tropical", "stadium",
+    "calendar", "festival", "building", "painting", "exercise", "question",
+    # Hard words (9+ letters)
+    "intelligence", "development", "conversation", "opportunity", "environment",
+    "celebration", "imagination", "technology", "restaurant", "experience",
+    "friendship", "challenge", "adventure", "wonderful", "beautiful"
+)
+
+DEFAULT_LANGUAGE = 'en'
+
+# Word lists for other languages live in words/<language>.txt (UTF-8, one
+# word per line) and are only read when a game asks for that language.
+WORDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'words')
+
+_JOINERS = '\u200d\ufe0f'
+
+
+def normalize_word(word):
+    # The stored form of a dictionary word: NFC, lower case. Anything that is
+    # not made of letters and combining marks is rejected with None.
+    if word.isascii():
+        return word.lower() if word.isalpha() else None
+    word = unicodedata.normalize('NFC', word).lower()
+    for char in word:
+        if not char.isalpha() and unicodedata.category(char)[0] != 'M':
+            return None
+    return word or None
+
+
+def match_key(text):
+    # What answers are compared by: case-folded and NFC-normalized, so
+    # "STRASSE", "Straße" and a decomposed "straße" are the same answer.
+    if text.isascii():
+        return text.lower()
+    return unicodedata.normalize('NFC', unicodedata.normalize('NFD', text).casefold())
+
+
+def graphemes(word):
+    # User-perceived characters: a letter together with its combining marks
+    # (and emoji joined by ZWJ). ASCII words come back unchanged, anything
+    # else as a list of cluster strings. The regex module's \X is used when
+    # installed; otherwise marks and joiners are attached to the preceding
+    # character, which covers precomposed and decomposed Latin, Greek,
+    # Cyrillic, Indic vowel signs and CJK.
+    if word.isascii():
+        return word
+    if HAS_REGEX:
+        return _GRAPHEME.findall(word)
+    clusters = []
+    for char in word:
+        if clusters and (unicodedata.category(char)[0] == 'M' or char in _JOINERS
+                         or clusters[-1][-1] == '\u200d'):
+            clusters[-1] += char
+        else:
+            clusters.append(char)
+    return clusters
+
+
+class WordCorpus:
+    # Words are stored sorted by length in one contiguous string. Inside a
+    # length bucket every word has the same size, so word i is found with a
+    # bisect over the (few) buckets and a multiplication - no per-word objects
+    # or offset tables are kept after loading.
+    def __init__(self, words):
+        buckets = {}
+        for word in dict.fromkeys(filter(None, map(normalize_word, words))):
+            buckets.setdefault(len(word), []).append(word)
+
+        self.lengths = sorted(buckets)
+        self._starts = []
+        self._bases = []
+        chunks = []
+        count = 0
+        base = 0
+        for length in self.lengths:
+            bucket = buckets.pop(length)
+            self._starts.append(count)
+            self._bases.append(base)
+            chunks.append(''.join(bucket))
+            count += len(bucket)
+            base += length * len(bucket)
+
+        self._text = ''.join(chunks)
+        self._count = count
+        self._anagrams = None
+        self._difficulty = None
+        self._fingerprint = None
+        self.path = None
+
+    @classmethod
+    def from_file(cls, path, encoding='utf-8'):
+        with open(path, 'r', encoding=encoding) as file:
+            corpus = cls(line.strip() for line in file)
+        corpus.path = path
+        return corpus
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("word index out of range")
+        bucket = bisect_right(self._starts, index) - 1
+        length = self.lengths[bucket]
+        offset = self._bases[bucket] + (index - self._starts[bucket]) * length
+        return self._text[offset:offset + length]
+
+    def __iter__(self):
+        text = self._text
+        for bucket, length in enumerate(self.lengths):
+            start = self._bases[bucket]
+            end = self._bases[bucket + 1] if bucket + 1 < len(self.lengths) else len(text)
+            for offset in range(start, end, length):
+                yield text[offset:offset + length]
+
+    @property
+    def anagrams(self):
+        if self._anagrams is None:
+            self._anagrams = AnagramIndex(self)
+        return self._anagrams
+
+    @property
+    def difficulty(self):
+        if self._difficulty is None:
+            self._difficulty = DifficultyIndex.for_corpus(self)
+        return self._difficulty
+
+    def isascii(self):
+        return self._text.isascii()
+
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = zlib.crc32(self._text.encode('utf-8'))
+        return self._fingerprint
+
+    def index(self, word):
+        return self.anagrams.index(word)
+
+    def index_range(self, min_length=1, max_length=None):
+        first = bisect_left(self.lengths, min_length)
+        if max_length is None:
+            last = len(self.lengths)
+        else:
+            last = bisect_right(self.lengths, max_length)
+        if first >= last:
+            return 0, 0
+        end = self._starts[last] if last < len(self.lengths) else self._count
+        return self._starts[first], end
+
+    def sample_range(self, start, end, k, rng=random):
+        return [self[i] for i in rng.sample(range(start, end), k)]
+
+    def sample(self, k, min_length=1, max_length=None, rng=random):
+        start, end = self.index_range(min_length, max_length)
+        return self.sample_range(start, end, k, rng)
+
+
+def signature(word):
+    if word.isascii():
+        return ''.join(sorted(word.lower()))
+    return ''.join(sorted(graphemes(match_key(word))))
+
+
+class AnagramIndex:
+    # Maps a sorted-letter signature to the corpus index of every word
+    # spelled with exactly those letters. Most signatures have a single word,
+    # so groups are stored as a bare int and only widened to a tuple on
+    # collision.
+    def __init__(self, corpus):
+        self.corpus = corpus
+        self._groups = {}
+        groups = self._groups
+        for index, word in enumerate(corpus):
+            key = signature(word)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = index
+            elif isinstance(group, int):
+                groups[key] = (group, index)
+            else:
+                groups[key] = group + (index,)
+
+        # Words that share their letters with at least one other word. Only
+        # these can be scrambled into a different real word.
+        self.ambiguous = frozenset(self.corpus[i] for group in groups.values()
+                                   if not isinstance(group, int) for i in group)
+        # Their match keys, so an answer that is some other anagram of the
+        # word is found with one set lookup. A different word with the same
+        # letters is always one of these.
+        self._keys = frozenset(word if word.isascii() else match_key(word) for word in self.ambiguous)
+
+    def anagrams(self, word):
+        group = self._groups.get(signature(word))
+        if group is None:
+            return ()
+        if isinstance(group, int):
+            return (self.corpus[group],)
+        return tuple(self.corpus[i] for i in group)
+
+    def index(self, word):
+        group = self._groups.get(signature(word))
+        for index in (group,) if isinstance(group, int) else group or ():
+            if self.corpus[index] == word:
+                return index
+        raise ValueError(f"{word!r} is not in the corpus")
+
+    def is_anagram(self, answer, word):
+        answer = match_key(answer)
+        key = match_key(word)
+        if answer == key:
+            return True
+        if len(answer) != len(key) or signature(answer) != signature(key):
+            return False
+        return answer in self._keys
+
+
+def load_corpus(path=None):
+    if path:
+        return WordCorpus.from_file(path)
+    return WordCorpus(DEFAULT_WORDS)
+
+
+def language_corpus(language=DEFAULT_LANGUAGE):
+    path = os.path.join(WORDS_DIR, f"{language}.txt")
+    if language == DEFAULT_LANGUAGE and not os.path.exists(path):
+        return shared_corpus()
+    return shared_corpus(path)
+
+
+# A corpus never changes once built, so every game in a process can share
+# the one loaded for its word file.
+_shared_corpora = {}
+
+
+def shared_corpus(path=None):
+    key = os.path.abspath(path) if path else None
+    corpus = _shared_corpora.get(key)
+    if corpus is None:
+        corpus = _shared_corpora[key] = load_corpus(path)
+    return corpus
+
+
+def warm_corpus(path=None):
+    # Process pool initializer: load the shared corpus for `path` and build
+    # the indexes rounds need before the first job arrives. Jobs then get
+    # it back with shared_corpus(path).
+    corpus = shared_corpus(path)
+    corpus.anagrams
+    corpus.difficulty
+    return corpus
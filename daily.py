@@ -0,0 +1,131 @@
+import datetime
+import random
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from engine import GameSession, scramble_word, words_for_round
+from storage import write_atomic
+from telemetry import NULL_TELEMETRY
+
+# Everyone playing on the same day gets the same words in the same order,
+# scrambled the same way: the set is drawn from the difficulty index with a
+# seed derived from the date and the word list.
+DAILY_LEVEL = {'word_count': 10, 'time_limit': 45, 'points': 20, 'min_score': 25, 'max_score': 85}
+DAILY_FILE = "word_scramble_daily.bin"
+DAILY_BOARD_PREFIX = 'daily-'
+
+# Cache file layout: header (the day as a date ordinal, the corpus
+# fingerprint and a unix expiry time), then per word a uint32 corpus index
+# and the scramble as length-prefixed UTF-8.
+DAILY_MAGIC = b'WSDC'
+DAILY_VERSION = 1
+DAILY_HEADER = struct.Struct('<4sHIIqH')
+DAILY_ENTRY = struct.Struct('<IH')
+
+DailyChallenge = namedtuple('DailyChallenge', 'day seed words scrambles')
+
+
+def daily_seed(day, corpus):
+    import hashlib
+
+    key = f"{day.isoformat()}:{corpus.fingerprint()}".encode('ascii')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+
+def daily_board(day):
+    return f"{DAILY_BOARD_PREFIX}{day.isoformat()}"
+
+
+def stale_daily_board(board, today=None):
+    # True for the board of an earlier day's challenge. Their results stay
+    # in the score log, but the score store does not keep their standings.
+    return board.startswith(DAILY_BOARD_PREFIX) and board < daily_board(today or datetime.date.today())
+
+
+def expiry(day):
+    # A set is good until local midnight at the end of its day.
+    return int(datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time()).timestamp())
+
+
+def generate(corpus, day):
+    seed = daily_seed(day, corpus)
+    rng = random.Random(seed)
+    words = words_for_round(corpus, DAILY_LEVEL, rng)
+    return DailyChallenge(day, seed, tuple(words), tuple(scramble_word(word, corpus, rng) for word in words))
+
+
+def save(challenge, corpus, path):
+    records = [DAILY_HEADER.pack(DAILY_MAGIC, DAILY_VERSION, challenge.day.toordinal(), corpus.fingerprint(),
+                                 expiry(challenge.day), len(challenge.words))]
+    for word, scrambled in zip(challenge.words, challenge.scrambles):
+        encoded = scrambled.encode('utf-8')
+        records.append(DAILY_ENTRY.pack(corpus.index(word), len(encoded)) + encoded)
+    write_atomic(path, b''.join(records))
+
+
+def load(path, corpus, day, now=None):
+    # Reading a cached set needs neither the anagram nor the difficulty
+    # index, only the word list itself.
+    with open(path, 'rb') as file:
+        data = file.read()
+    magic, version, ordinal, fingerprint, expires, count = DAILY_HEADER.unpack_from(data)
+    if (magic, version, ordinal, fingerprint) != (DAILY_MAGIC, DAILY_VERSION, day.toordinal(), corpus.fingerprint()):
+        raise ValueError(f"{path} holds a different daily set")
+    if expires <= (time.time() if now is None else now):
+        raise ValueError(f"{path} has expired")
+    words = []
+    scrambles = []
+    offset = DAILY_HEADER.size
+    for _ in range(count):
+        index, length = DAILY_ENTRY.unpack_from(data, offset)
+        offset += DAILY_ENTRY.size
+        if index >= len(corpus) or offset + length > len(data):
+            raise ValueError(f"{path} is corrupt")
+        words.append(corpus[index])
+        scrambles.append(data[offset:offset + length].decode('utf-8'))
+        offset += length
+    return DailyChallenge(day, daily_seed(day, corpus), tuple(words), tuple(scrambles))
+
+
+_challenges = {}
+_challenges_lock = threading.Lock()
+
+
+def daily_challenge(corpus, day=None, path=DAILY_FILE):
+    # The set for a day is built at most once per process and word list and
+    # then handed to every caller; other processes (and restarts) pick it up
+    # from `path`. Concurrent first callers wait on the lock for one build
+    # rather than each doing their own. Pass path=None to skip the file.
+    day = day or datetime.date.today()
+    key = (day, corpus.fingerprint())
+    challenge = _challenges.get(key)
+    if challenge is not None:
+        return challenge
+    with _challenges_lock:
+        challenge = _challenges.get(key)
+        if challenge is not None:
+            return challenge
+        if path is not None:
+            try:
+                challenge = load(path, corpus, day)
+            except (OSError, ValueError, struct.error):
+                pass
+        if challenge is None:
+            challenge = generate(corpus, day)
+            if path is not None:
+                try:
+                    save(challenge, corpus, path)
+                except OSError:
+                    pass
+        # Earlier days are finished with.
+        for stale in [stale for stale in _challenges if stale[0] != day]:
+            del _challenges[stale]
+        _challenges[key] = challenge
+        return challenge
+
+
+def daily_session(corpus, challenge, telemetry=NULL_TELEMETRY):
+    return GameSession(corpus, DAILY_LEVEL, list(challenge.words), scrambles=list(challenge.scrambles),
+                       telemetry=telemetry)
@@ -0,0 +1,146 @@
+import math
+import os
+import random
+import struct
+from array import array
+from collections import Counter
+
+from storage import write_atomic
+
+# Cached index file layout: header, then one uint32 corpus index per word in
+# order of increasing hardness.
+INDEX_MAGIC = b'WSDI'
+INDEX_VERSION = 2
+INDEX_HEADER = struct.Struct('<4sHII')
+
+
+def cache_file(word_file):
+    # The index of a word list is cached in the working directory with the
+    # game's other files, not next to the dictionary.
+    return f"word_scramble_{os.path.basename(word_file)}.difficulty"
+
+
+def log2_factorial(n):
+    return math.lgamma(n + 1) / math.log(2)
+
+
+LOG2_FACTORIALS = [log2_factorial(n) for n in range(64)]
+
+
+def word_hardness(word, letter_bits, anagram_count):
+    # `word` is a sequence of grapheme clusters (corpus.graphemes).
+    # Three ingredients, all in bits so they add up sensibly:
+    #  - scramble space: log2 of the number of distinct orderings of the
+    #    letters. Repeated letters shrink it and leave more letters in place.
+    #  - rarity: average surprise of the letters under corpus frequencies
+    #    (a word full of q/z/x is harder to spot than one of e/t/a).
+    #  - ambiguity: every extra dictionary anagram is another accepted
+    #    answer, which makes the puzzle easier.
+    space = LOG2_FACTORIALS[len(word)] if len(word) < len(LOG2_FACTORIALS) else log2_factorial(len(word))
+    rarity = 0.0
+    for char in set(word):
+        count = word.count(char)
+        if count > 1:
+            space -= log2_factorial(count)
+        rarity += letter_bits[char] * count
+    rarity /= len(word)
+    return space + rarity - math.log2(anagram_count)
+
+
+class DifficultyIndex:
+    # Corpus word indices sorted from easiest to hardest. A word's difficulty
+    # score is its percentile (0-100) in that order, so a band of scores is a
+    # contiguous slice and drawing k words from a band is O(k).
+    def __init__(self, corpus, order):
+        self.corpus = corpus
+        self.order = order
+
+    @classmethod
+    def build(cls, corpus):
+        from corpus import graphemes  # corpus imports this module
+
+        # Letters are grapheme clusters; an ASCII corpus skips the split.
+        def split(words):
+            return words if corpus.isascii() else map(graphemes, words)
+
+        letters = Counter()
+        for letters_of_word in split(corpus):
+            letters.update(letters_of_word)
+        total = sum(letters.values())
+        letter_bits = {char: -math.log2(count / total) for char, count in letters.items()}
+
+        anagrams = corpus.anagrams
+        hardness = array('d', (
+            word_hardness(letters_of_word, letter_bits,
+                          len(anagrams.anagrams(word)) if word in anagrams.ambiguous else 1)
+            for word, letters_of_word in zip(corpus, split(corpus))
+        ))
+        order = array('I', sorted(range(len(corpus)), key=hardness.__getitem__))
+        return cls(corpus, order)
+
+    @classmethod
+    def load(cls, path, corpus):
+        with open(path, 'rb') as file:
+            magic, version, count, fingerprint = INDEX_HEADER.unpack(file.read(INDEX_HEADER.size))
+            if (magic, version, count, fingerprint) != (INDEX_MAGIC, INDEX_VERSION, len(corpus), corpus.fingerprint()):
+                raise ValueError(f"{path} was built for a different corpus")
+            order = array('I')
+            order.fromfile(file, count)
+        return cls(corpus, order)
+
+    @classmethod
+    def for_corpus(cls, corpus):
+        # Reuse the cached index when it matches the corpus, otherwise build
+        # the index and cache it for next time.
+        if corpus.path is None:
+            return cls.build(corpus)
+        cache_path = cache_file(corpus.path)
+        try:
+            return cls.load(cache_path, corpus)
+        except (OSError, ValueError, EOFError, struct.error):
+            pass
+        index = cls.build(corpus)
+        try:
+            index.save(cache_path)
+        except OSError:
+            pass
+        return index
+
+    def save(self, path):
+        write_atomic(path, INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(self.order), self.corpus.fingerprint())
+                     + self.order.tobytes())
+
+    def band(self, min_score=0, max_score=100):
+        return DifficultyBand(self, min_score, max_score)
+
+    def position_range(self, min_score=0, max_score=100):
+        count = len(self.order)
+        return count * min_score // 100, count * max_score // 100
+
+    def sample(self, k, min_score=0, max_score=100, rng=random):
+        # When the band holds fewer than k words, widen it evenly on both
+        # sides so the round is padded with the nearest-difficulty words
+        # rather than arbitrary ones.
+        start, end = self.position_range(min_score, max_score)
+        k = min(k, len(self.order))
+        missing = k - (end - start)
+        if missing > 0:
+            start = max(0, start - (missing + 1) // 2)
+            end = min(len(self.order), start + k)
+            start = end - k
+        return [self.corpus[self.order[position]] for position in rng.sample(range(start, end), k)]
+
+
+class DifficultyBand:
+    # The words of one score band, in the same shape as a compiled tier's
+    # selection (tiers.WordSelection): `size` words to draw from and
+    # sample(k, rng).
+    def __init__(self, index, min_score=0, max_score=100):
+        self.index = index
+        self.min_score = min_score
+        self.max_score = max_score
+        start, end = index.position_range(min_score, max_score)
+        self.size = max(1, end - start)
+
+    def sample(self, k, rng=random):
+        return self.index.sample(k, self.min_score, self.max_score, rng)
@@ -0,0 +1,148 @@
+import random
+from collections import namedtuple
+
+from corpus import graphemes
+from telemetry import NULL_TELEMETRY
+
+# Give up on finding a scramble that is not itself a word after this many
+# shuffles (e.g. "aaa", or words whose every ordering is in the dictionary).
+MAX_SCRAMBLE_ATTEMPTS = 100
+
+# Points taken off a word's score for each hint used on it, in the order the
+# hints are offered.
+HINT_COSTS = {'first': 5, 'letter': 5, 'anagrams': 3}
+
+Puzzle = namedtuple('Puzzle', 'number total word scrambled time_limit points')
+Verdict = namedtuple('Verdict', 'word answer correct timed_out elapsed points time_bonus hint_cost round_score score')
+
+
+def level_selection(corpus, level):
+    # Levels compiled from a tiers file (tiers.compile_tiers) carry their
+    # own selection index. Any other level picks its words from a band of
+    # the corpus difficulty index: min_score/max_score are percentiles of
+    # words ranked from easiest (0) to hardest (100).
+    selection = level.get('selection')
+    if selection is None:
+        if 'min_length' in level:
+            raise ValueError("a level with a length band has to be compiled (tiers.compile_tier) first")
+        selection = corpus.difficulty.band(level['min_score'], level['max_score'])
+    return selection
+
+
+def words_for_round(corpus, level, rng=random):
+    return level_selection(corpus, level).sample(level['word_count'], rng)
+
+
+def scramble_word(word, corpus, rng=random):
+    # Reject scrambles that spell another dictionary word - the player
+    # would be shown a "puzzle" that is already a valid answer. Such a word
+    # necessarily has anagram siblings, so the ambiguous set covers it.
+    # Letters are shuffled as grapheme clusters so accents and other
+    # combining marks stay on their letter.
+    real_words = corpus.anagrams.ambiguous
+    chars = list(graphemes(word))
+    fallback = word
+    for _ in range(MAX_SCRAMBLE_ATTEMPTS):
+        rng.shuffle(chars)
+        scrambled = ''.join(chars)
+        if scrambled == word:
+            if len(chars) <= 2:
+                return scrambled
+            continue
+        if scrambled not in real_words:
+            return scrambled
+        fallback = scrambled
+    return fallback
+
+
+def time_bonus(time_limit, elapsed):
+    return max(0, int((time_limit - elapsed) / 5))
+
+
+class GameSession:
+    # One player's round with no terminal I/O: the caller asks for the next
+    # puzzle, measures how long the player took however it likes, and submits
+    # the answer (None when the player ran out of time).
+    __slots__ = ('corpus', 'level', 'rng', 'words', 'scrambles', 'score', 'position', 'current', 'hints_used',
+                 'telemetry')
+
+    def __init__(self, corpus, level, words=None, rng=random, scrambles=None, telemetry=NULL_TELEMETRY):
+        self.corpus = corpus
+        self.level = level
+        self.rng = rng
+        self.words = words if words is not None else words_for_round(corpus, level, rng)
+        # Pre-generated scrambles (e.g. from a PuzzlePool), parallel to words.
+        self.scrambles = scrambles
+        self.score = 0
+        self.position = 0
+        self.current = None
+        self.hints_used = ()
+        self.telemetry = telemetry
+
+    @property
+    def total(self):
+        return len(self.words)
+
+    @property
+    def finished(self):
+        return self.position >= self.total
+
+    def choose_word(self):
+        return self.words[self.position]
+
+    def limits(self, word):
+        return self.level['time_limit'], self.level['points']
+
+    def next_puzzle(self):
+        if self.current is None:
+            word = self.choose_word()
+            if self.scrambles is not None:
+                scrambled = self.scrambles[self.position]
+            else:
+                scrambled = scramble_word(word, self.corpus, self.rng)
+            time_limit, points = self.limits(word)
+            self.current = Puzzle(self.position + 1, self.total, word, scrambled, time_limit, points)
+            self.telemetry.emit('word_served', word=word, number=self.current.number, length=len(word))
+        return self.current
+
+    def next_hint(self):
+        for kind in HINT_COSTS:
+            if kind not in self.hints_used:
+                return kind
+        return None
+
+    def use_hint(self, kind):
+        # Each kind counts once per word; the cost comes off that word's
+        # score (never below zero) when it is answered.
+        self.next_puzzle()
+        if kind not in self.hints_used:
+            self.hints_used += (kind,)
+        return HINT_COSTS[kind]
+
+    def submit(self, answer, elapsed):
+        puzzle = self.next_puzzle()
+        time_limit = puzzle.time_limit
+        points = puzzle.points
+        hint_cost = sum(HINT_COSTS[kind] for kind in self.hints_used)
+        self.current = None
+        self.hints_used = ()
+        self.position += 1
+
+        if answer is None or elapsed >= time_limit:
+            verdict = Verdict(puzzle.word, answer, False, True, elapsed, 0, 0, hint_cost, 0, self.score)
+        elif not self.corpus.anagrams.is_anagram(answer, puzzle.word):
+            verdict = Verdict(puzzle.word, answer, False, False, elapsed, 0, 0, hint_cost, 0, self.score)
+        else:
+            # Levels without a per-word limit (blitz) give the bonus against
+            # a fixed `bonus_time` instead.
+            bonus = time_bonus(self.level.get('bonus_time', time_limit), elapsed)
+            round_score = max(0, points + bonus - hint_cost)
+            self.score += round_score
+            verdict = Verdict(puzzle.word, answer, True, False, elapsed, points, bonus, hint_cost, round_score,
+                              self.score)
+
+        if self.telemetry.enabled:
+            outcome = 'timeout' if verdict.timed_out else 'correct' if verdict.correct else 'wrong'
+            self.telemetry.emit('answer', word=puzzle.word, elapsed=round(elapsed, 4), verdict=outcome,
+                                round_score=verdict.round_score)
+        return verdict
@@ -1,50 +1,58 @@
-import random
 import time
 import os
-import json
+import random
+import sys
 from datetime import datetime
 
-# For colorful text in terminal
-try:
-    import colorama
-    from colorama import Fore, Back, Style
-    colorama.init(autoreset=True)
-    HAS_COLORS = True
-except ImportError:
-    HAS_COLORS = False
-    class DummyColors:
-        def __getattr__(self, name):
-            return ""
-    Fore = Back = Style = DummyColors()
+from adaptive import ADAPTIVE_LEVEL, AdaptiveSession, RatingStore
+from blitz import BLITZ_LEVEL, BlitzSession
+from corpus import DEFAULT_LANGUAGE, language_corpus, shared_corpus
+from daily import (DAILY_BOARD_PREFIX, DAILY_FILE, DAILY_LEVEL, daily_board, daily_challenge, daily_session,
+                   stale_daily_board)
+from engine import HINT_COSTS, GameSession, scramble_word, time_bonus, words_for_round
+from hints import HintCache
+from render import Screen, display_width, stdin_reader
+from replay import ReplayRecorder, append_replay, new_seed
+from scores import ALL_BOARD, ScoreStore
+from telemetry import NULL_TELEMETRY, JsonlSink, Telemetry
+from tiers import TIERS_FILE, compile_tiers, load_tiers, tier_summary
+
+# For colorful text in terminal. colorama is imported the first time a color
+# is used, so importing the game or creating a WordScrambleGame never pays
+# for it; without colorama every color is an empty string.
+_colorama = None
+
+
+def load_colorama():
+    global _colorama
+    if _colorama is None:
+        try:
+            import colorama
+            colorama.init(autoreset=True)
+            _colorama = colorama
+        except ImportError:
+            _colorama = False
+    return _colorama
+
+
+class LazyColors:
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, name):
+        colorama = load_colorama()
+        value = getattr(getattr(colorama, self._name), name) if colorama else ""
+        setattr(self, name, value)
+        return value
+
+
+Fore = LazyColors('Fore')
+Back = LazyColors('Back')
+Style = LazyColors('Style')
 
 class WordScrambleGame:
-    def __init__(self):
-        self.score = 0
-        self.player_name = ""
-        self.leaderboard_file = "word_scramble_leaderboard.json"
-        self.difficulty_levels = {
-            'easy': {'word_count': 10, 'time_limit': 60, 'points': 10, 'color': Fore.GREEN},
-            'medium': {'word_count': 15, 'time_limit': 45, 'points': 20, 'color': Fore.YELLOW},
-            'hard': {'word_count': 20, 'time_limit': 30, 'points': 30, 'color': Fore.RED}
-        }
-        self.selected_difficulty = 'medium'
-
-        self.word_bank = [
-            # Easy words (4-5 letters)
-            "cake", "game", "blue", "jump", "play", "talk", "walk", "fast", "swim", "read",
-            "sing", "time", "road", "hand", "feet", "desk", "book", "file", "door", "city",
-            # Medium words (6-8 letters)
-            "computer", "language", "internet", "victory", "journey", "student", "practice",
-            "mountain", "elephant", "universe", "chocolate", "keyboard", "tropical", "stadium",
-            "calendar", "festival", "building", "painting", "exercise", "question",
-            # Hard words (9+ letters)
-            "intelligence", "development", "conversation", "opportunity", "environment",
-            "celebration", "imagination", "technology", "restaurant", "experience",
-            "friendship", "challenge", "adventure", "wonderful", "beautiful"
-        ]
-
-        # ASCII art for game logo
-        self.logo = """
+    # ASCII art for game logo
+    logo = """
         ██╗    ██╗ ██████╗ ██████╗ ██████╗     ███████╗ ██████╗██████╗  █████╗ ███╗   ███╗██████╗ ██╗     ███████╗
         ██║    ██║██╔═══██╗██╔══██╗██╔══██╗    ██╔════╝██╔════╝██╔══██╗██╔══██╗████╗ ████║██╔══██╗██║     ██╔════╝
         ██║ █╗ ██║██║   ██║██████╔╝██║  ██║    ███████╗██║     ██████╔╝███████║██╔████╔██║██████╔╝██║     █████╗  
@@ -53,7 +61,7 @@ class WordScrambleGame:
          ╚══╝╚══╝  ╚═════╝ ╚═╝  ╚═╝╚═════╝     ╚══════╝ ╚═════╝╚═╝  ╚═╝╚═╝  ╚═╝╚═╝     ╚═╝╚═════╝ ╚══════╝╚══════╝
         """
 
-        self.trophy = """
+    trophy = """
               .-=========-.
               \\'-=======-'/
               _|   .=.   |_
@@ -65,54 +73,167 @@ class WordScrambleGame:
               /___________\\
         """
 
-    def display_animated_text(self, text, delay=0.03, color=None):
-        for char in text:
-            if color:
-                print(f"{color}{char}", end='', flush=True)
-            else:
-                print(char, end='', flush=True)
-            time.sleep(delay)
-        print()
+    def __init__(self, word_file=None, animation=1.0, telemetry=NULL_TELEMETRY, language=DEFAULT_LANGUAGE,
+                 tiers=None):
+        self.telemetry = telemetry
+        self.screen = Screen(animation=animation, telemetry=telemetry)
+        self.score = 0
+        self.player_name = ""
+        self.leaderboard_file = "word_scramble_leaderboard.json"
+        self.scores_file = "word_scramble_scores.jsonl"
+        self._scores = None
+        self.ratings_file = "word_scramble_ratings.db"
+        self.legacy_ratings_file = "word_scramble_ratings"
+        self.replays_file = "word_scramble_replays.bin"
+        self.daily_file = DAILY_FILE
+        self.daily = None
+        self._ratings = None
+        self._hints = None
+        self.tiers_file = TIERS_FILE
+        self._tiers = tiers
+        self._compiled_tiers = None
+        self._difficulty_levels = None
+        self.selected_difficulty = 'medium'
 
-    def load_leaderboard(self):
-        if os.path.exists(self.leaderboard_file):
-            try:
-                with open(self.leaderboard_file, 'r') as file:
-                    return json.load(file)
-            except:
-                return []
-        else:
-            return []
+        self.word_file = word_file
+        self.language = language
+        self._corpus = None
 
-    def save_leaderboard(self, leaderboard):
-        with open(self.leaderboard_file, 'w') as file:
-            json.dump(leaderboard, file)
+    def display_animated_text(self, text, delay=0.03, color=None):
+        self.screen.animate(text, delay, color)
 
-    def update_leaderboard(self):
-        leaderboard = self.load_leaderboard()
+    @property
+    def corpus(self):
+        if self._corpus is None:
+            if self.word_file:
+                self._corpus = shared_corpus(self.word_file)
+            else:
+                self._corpus = language_corpus(self.language)
+        return self._corpus
+
+    @property
+    def tiers(self):
+        if self._tiers is None:
+            self._tiers = load_tiers(self.tiers_file)
+        return self._tiers
+
+    @property
+    def compiled_tiers(self):
+        # Each tier's word selection is worked out once. The game does it at
+        # launch so a tier that matches no words is reported before play.
+        if self._compiled_tiers is None:
+            self._compiled_tiers = compile_tiers(self.tiers, self.corpus)
+        return self._compiled_tiers
+
+    @property
+    def difficulty_levels(self):
+        # Everything the menus show, in menu order: the tiers from the tiers
+        # file, then the modes with rules of their own. point_range and
+        # max_bonus are what one word can score.
+        if self._difficulty_levels is None:
+            self._difficulty_levels = {
+                name: dict(tier, color=getattr(Fore, tier['color']), summary=tier_summary(tier),
+                           point_range=(tier['points'], tier['points']), max_bonus=time_bonus(tier['time_limit'], 0))
+                for name, tier in self.tiers.items()
+            }
+            level = ADAPTIVE_LEVEL
+            self._difficulty_levels['adaptive'] = dict(
+                level, color=Fore.MAGENTA, label="Adaptive", title="ADAPTIVE MODE - RATED",
+                description="Words follow your rating",
+                point_range=(level['min_points'], level['max_points']),
+                max_bonus=time_bonus(level['max_time_limit'], 0),
+                summary=[f"{level['word_count']} words",
+                         f"{level['min_time_limit']}-{level['max_time_limit']} seconds per word",
+                         f"{level['min_points']}-{level['max_points']} points per word", "Words matched to you"])
+            level = BLITZ_LEVEL
+            self._difficulty_levels['blitz'] = dict(
+                level, color=Fore.BLUE, label="Blitz", title="BLITZ MODE - SPEED",
+                description="One clock, as many words as you can",
+                point_range=(level['points'], level['points']), max_bonus=time_bonus(level['bonus_time'], 0),
+                summary=[f"{level['duration']} seconds in total", "As many words as you can",
+                         f"{level['points']} points per word", "Own leaderboard"])
+            level = DAILY_LEVEL
+            self._difficulty_levels['daily'] = dict(
+                level, color=Fore.LIGHTCYAN_EX, label="Daily", title="DAILY CHALLENGE - TODAY",
+                description="Today's puzzles, same for everyone",
+                point_range=(level['points'], level['points']), max_bonus=time_bonus(level['time_limit'], 0),
+                summary=[f"{level['word_count']} words", "Same words for everyone",
+                         f"{level['points']} points per word", "Daily leaderboard"])
+        return self._difficulty_levels
+
+    @property
+    def scores(self):
+        if self._scores is None:
+            started = time.perf_counter()
+            self._scores = ScoreStore(self.scores_file, legacy_path=self.leaderboard_file,
+                                     expired=stale_daily_board)
+            self.telemetry.emit('leaderboard_open', duration=time.perf_counter() - started,
+                                entries=self._scores.entries)
+        return self._scores
+
+    @property
+    def hints(self):
+        if self._hints is None:
+            self._hints = HintCache(self.corpus)
+        return self._hints
+
+    @property
+    def ratings(self):
+        if self._ratings is None:
+            self._ratings = RatingStore(self.ratings_file, self.legacy_ratings_file)
+        return self._ratings
+
+    def close(self):
+        # Only what this run actually opened.
+        if self._ratings is not None:
+            self._ratings.close()
+        if self._scores is not None:
+            self._scores.close()
+
+    def load_leaderboard(self, board=ALL_BOARD):
+        # Other game processes may have finished since we last looked.
+        scores = self.scores
+        started = time.perf_counter()
+        scores.refresh()
+        leaderboard = scores.top(board)
+        self.telemetry.emit('leaderboard_load', duration=time.perf_counter() - started, board=board)
+        return leaderboard
 
+    def update_leaderboard(self):
         entry = {
             'name': self.player_name,
             'score': self.score,
             'difficulty': self.selected_difficulty,
             'date': datetime.now().strftime("%Y-%m-%d %H:%M")
         }
+        boards = (ALL_BOARD, self.selected_difficulty)
+        if self.selected_difficulty == 'daily':
+            # Results also go on the board of the day the set was drawn for.
+            entry['board'] = daily_board(self.daily.day)
+            boards = (entry['board'],) + boards
+
+        scores = self.scores
+        started = time.perf_counter()
+        ranks = scores.record(entry)
+        self.telemetry.emit('leaderboard_save', duration=time.perf_counter() - started)
+
+        for board in boards:
+            player_rank = ranks.get(board)
+            if player_rank is not None and player_rank <= 3:
+                self.display_congratulations(player_rank, board)
+                break
 
-        leaderboard.append(entry)
-        leaderboard.sort(key=lambda x: x['score'], reverse=True)
-        leaderboard = leaderboard[:10]
-        self.save_leaderboard(leaderboard)
-
-        player_rank = next((i for i, item in enumerate(leaderboard)
-                            if item['name'] == self.player_name and
-                               item['score'] == self.score and
-                               item['date'] == entry['date']), -1)
-
-        if player_rank < 3 and player_rank != -1:
-            self.display_congratulations(player_rank + 1)
+        # A set finished after midnight belongs to a board that has already
+        # been retired.
+        standing = scores.player_rank(self.player_name, entry['board']) if 'board' in entry else None
+        if standing is not None:
+            board = entry['board']
+            self.screen.print(f"\n{Fore.CYAN}Today's standing: {Fore.YELLOW}#{standing}"
+                              f"{Fore.CYAN} of {scores.players(board)} players "
+                              f"{Fore.WHITE}(your best today: {scores.best(self.player_name, board)})")
 
-    def display_congratulations(self, rank):
-        os.system('cls' if os.name == 'nt' else 'clear')
+    def display_congratulations(self, rank, board=ALL_BOARD):
+        self.screen.clear()
 
         medals = {
             1: f"{Fore.YELLOW}🥇 GOLD MEDAL 🥇",
@@ -122,26 +243,33 @@ class WordScrambleGame:
 
         medal_display = medals.get(rank, "")
 
-        print(f"{Fore.CYAN}{self.trophy}")
-        print(f"\n{Fore.YELLOW}🎉 CONGRATULATIONS {self.player_name.upper()}! 🎉")
-        print(f"\n{medal_display}")
-        print(f"\n{Fore.CYAN}You've reached RANK #{rank} on the leaderboard!")
-        print(f"{Fore.CYAN}Your score: {Fore.YELLOW}{self.score} points")
-
-        input(f"\n{Style.DIM}Press Enter to continue...{Style.RESET_ALL}")
-
-    def display_leaderboard(self):
-        leaderboard = self.load_leaderboard()
+        self.screen.print(f"{Fore.CYAN}{self.trophy}")
+        self.screen.print(f"\n{Fore.YELLOW}🎉 CONGRATULATIONS {self.player_name.upper()}! 🎉")
+        self.screen.print(f"\n{medal_display}")
+        board_name = "the" if board == ALL_BOARD else f"the {board.upper()}"
+        self.screen.print(f"\n{Fore.CYAN}You've reached RANK #{rank} on {board_name} leaderboard!")
+        self.screen.print(f"{Fore.CYAN}Your score: {Fore.YELLOW}{self.score} points")
+
+        self.screen.input(f"\n{Style.DIM}Press Enter to continue...{Style.RESET_ALL}")
+
+    def display_leaderboard(self, board=ALL_BOARD):
+        leaderboard = self.load_leaderboard(board)
+        if board == ALL_BOARD:
+            title = "WORD SCRAMBLE CHALLENGE"
+        elif board.startswith(DAILY_BOARD_PREFIX):
+            title = f"DAILY CHALLENGE {board[len(DAILY_BOARD_PREFIX):]}"
+        else:
+            title = f"{board.upper()} MODE"
 
-        print(f"\n{Fore.CYAN}{'=' * 70}")
-        print(f"{Fore.YELLOW}🏆 WORD SCRAMBLE CHALLENGE LEADERBOARD 🏆".center(70))
-        print(f"{Fore.CYAN}{'=' * 70}")
+        self.screen.print(f"\n{Fore.CYAN}{'=' * 70}")
+        self.screen.print(f"{Fore.YELLOW}🏆 {title} LEADERBOARD 🏆".center(70))
+        self.screen.print(f"{Fore.CYAN}{'=' * 70}")
 
         if not leaderboard:
-            print(f"{Fore.WHITE}No scores recorded yet. Be the first one!".center(70))
+            self.screen.print(f"{Fore.WHITE}No scores recorded yet. Be the first one!".center(70))
         else:
-            print(f"{Fore.CYAN}{'Rank':<6}{'Name':<15}{'Score':<10}{'Difficulty':<12}{'Date':<20}")
-            print(f"{Fore.CYAN}{'-' * 70}")
+            self.screen.print(f"{Fore.CYAN}{'Rank':<6}{'Name':<15}{'Score':<10}{'Difficulty':<12}{'Date':<20}")
+            self.screen.print(f"{Fore.CYAN}{'-' * 70}")
 
             for i, entry in enumerate(leaderboard):
                 if i == 0:
@@ -153,100 +281,51 @@ class WordScrambleGame:
                 else:
                     rank_color = Fore.CYAN
 
-                diff_color = self.difficulty_levels[entry['difficulty']]['color']
+                diff_color = self.difficulty_levels.get(entry['difficulty'], {}).get('color', Fore.CYAN)
 
-                print(f"{rank_color}{i+1:<6}{Fore.WHITE}{entry['name']:<15}{Fore.GREEN}{entry['score']:<10}{diff_color}{entry['difficulty']:<12}{Fore.CYAN}{entry['date']:<20}")
+                self.screen.print(f"{rank_color}{i+1:<6}{Fore.WHITE}{entry['name']:<15}{Fore.GREEN}{entry['score']:<10}{diff_color}{entry['difficulty']:<12}{Fore.CYAN}{entry['date']:<20}")
 
-        print(f"{Fore.CYAN}{'=' * 70}\n")
+        self.screen.print(f"{Fore.CYAN}{'=' * 70}\n")
 
     def scramble_word(self, word):
-        chars = list(word)
-        while True:
-            random.shuffle(chars)
-            scrambled = ''.join(chars)
-            if scrambled != word:
-                return scrambled
-            if len(word) <= 2:
-                return scrambled
+        return scramble_word(word, self.corpus)
+
+    @staticmethod
+    def difficulty_art(level):
+        lines = [f"✓ {line}" for line in level['summary']]
+        width = max(27, len(level['title']) + 4, *(len(line) + 1 for line in lines))
+        rows = [f"┌{'─' * width}┐", f"│{level['title']:^{width}}│", f"├{'─' * width}┤"]
+        rows += [f"│ {line:<{width - 1}}│" for line in lines]
+        rows.append(f"└{'─' * width}┘")
+        return f"{level['color']}\n" + "".join(f"            {row}\n" for row in rows) + "            "
 
     def display_difficulty_selection(self):
-        difficulty_art = [
-            f"""{Fore.GREEN}
-            ┌───────────────────────────┐
-            │   EASY MODE - BEGINNER    │
-            ├───────────────────────────┤
-            │ ✓ 10 words                │
-            │ ✓ 60 seconds per word     │
-            │ ✓ 10 points per word      │
-            │ ✓ Shorter words (4-5)     │
-            └───────────────────────────┘
-            """,
-
-            f"""{Fore.YELLOW}
-            ┌───────────────────────────┐
-            │   MEDIUM MODE - CASUAL    │
-            ├───────────────────────────┤
-            │ ✓ 15 words                │
-            │ ✓ 45 seconds per word     │
-            │ ✓ 20 points per word      │
-            │ ✓ Medium words (6-8)      │
-            └───────────────────────────┘
-            """,
-
-            f"""{Fore.RED}
-            ┌───────────────────────────┐
-            │    HARD MODE - EXPERT     │
-            ├───────────────────────────┤
-            │ ✓ 20 words                │
-            │ ✓ 30 seconds per word     │
-            │ ✓ 30 points per word      │
-            │ ✓ Longer words (9+)       │
-            └───────────────────────────┘
-            """
-        ]
+        difficulty_art = [self.difficulty_art(level) for level in self.difficulty_levels.values()]
 
-        print("\n" + "\n".join(difficulty_art))
+        self.screen.print("\n" + "\n".join(difficulty_art))
 
     def select_difficulty(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print(f"{Fore.CYAN}{self.logo}")
-        print(f"\n{Fore.YELLOW}=== DIFFICULTY SELECTION ==={Style.RESET_ALL}")
+        self.screen.clear()
+        self.screen.print(f"{Fore.CYAN}{self.logo}")
+        self.screen.print(f"\n{Fore.YELLOW}=== DIFFICULTY SELECTION ==={Style.RESET_ALL}")
 
         self.display_difficulty_selection()
 
-        print(f"\n{Fore.WHITE}Select your challenge level:")
-        print(f"{Fore.GREEN}1. Easy   {Fore.WHITE}- For a relaxed gameplay experience")
-        print(f"{Fore.YELLOW}2. Medium {Fore.WHITE}- Balanced challenge (recommended)")
-        print(f"{Fore.RED}3. Hard   {Fore.WHITE}- For word masters only!")
+        self.screen.print(f"\n{Fore.WHITE}Select your challenge level:")
+        choices = list(self.difficulty_levels)
+        for number, name in enumerate(choices, 1):
+            level = self.difficulty_levels[name]
+            self.screen.print(f"{level['color']}{number}. {level['label']:<9}{Fore.WHITE}- {level['description']}")
 
         while True:
-            choice = input(f"\n{Fore.CYAN}Enter your choice (1-3): {Fore.WHITE}").strip()
-            if choice == '1':
-                self.selected_difficulty = 'easy'
-                break
-            elif choice == '2':
-                self.selected_difficulty = 'medium'
-                break
-            elif choice == '3':
-                self.selected_difficulty = 'hard'
+            choice = self.screen.input(f"\n{Fore.CYAN}Enter your choice (1-{len(choices)}): {Fore.WHITE}").strip()
+            if choice.isdigit() and 1 <= int(choice) <= len(choices):
+                self.selected_difficulty = choices[int(choice) - 1]
                 break
-            else:
-                print(f"{Fore.RED}Invalid choice. Please enter 1, 2, or 3.")
-
-    def get_words_for_round(self):
-        if self.selected_difficulty == 'easy':
-            words = [w for w in self.word_bank if len(w) <= 5]
-        elif self.selected_difficulty == 'medium':
-            words = [w for w in self.word_bank if 6 <= len(w) <= 8]
-        else:  
-            words = [w for w in self.word_bank if len(w) >= 9]
-
-        if len(words) < self.difficulty_levels[self.selected_difficulty]['word_count']:
-            additional = random.sample(self.word_bank,
-                                     self.difficulty_levels[self.selected_difficulty]['word_count'] - len(words))
-            words.extend(additional)
+            self.screen.print(f"{Fore.RED}Invalid choice. Please enter a number from 1 to {len(choices)}.")
 
-        return random.sample(words, self.difficulty_levels[self.selected_difficulty]['word_count'])
+    def get_words_for_round(self, rng=random):
+        return words_for_round(self.corpus, self.compiled_tiers[self.selected_difficulty], rng)
 
     def display_countdown(self, seconds):
         for i in range(seconds, 0, -1):
@@ -257,118 +336,236 @@ class WordScrambleGame:
             else:
                 color = Fore.GREEN
 
-            print(f"{color}{i}...", end='\r')
-            time.sleep(0.7)
-        print(f"{Fore.CYAN}GO!{' ' * 10}")
-        time.sleep(0.3)
+            self.screen.print(f"{color}{i}...", end='\r')
+            self.screen.pause(0.7)
+        self.screen.print(f"{Fore.CYAN}GO!{' ' * 10}")
+        self.screen.pause(0.3)
 
     def play_round(self):
+        if self.selected_difficulty == 'blitz':
+            return self.play_blitz()
         self.score = 0
-        words = self.get_words_for_round()
-        word_count = self.difficulty_levels[self.selected_difficulty]['word_count']
-        time_limit = self.difficulty_levels[self.selected_difficulty]['time_limit']
-        points_per_word = self.difficulty_levels[self.selected_difficulty]['points']
-        difficulty_color = self.difficulty_levels[self.selected_difficulty]['color']
-
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print(f"{Fore.CYAN}{self.logo}")
-
-        print(f"\n{difficulty_color}{'=' * 70}")
-        print(
+        level = self.difficulty_levels[self.selected_difficulty]
+        telemetry = self.telemetry.bind(difficulty=self.selected_difficulty, player=self.player_name)
+        # Every round gets its own seeded generator. Fixed-level rounds are
+        # recorded so they can be replayed and re-scored later; adaptive
+        # rounds also depend on the stored ratings and are not. The daily
+        # challenge plays the shared set for today.
+        seed = new_seed()
+        rng = random.Random(seed)
+        if self.selected_difficulty == 'adaptive':
+            session = AdaptiveSession(self.corpus, self.ratings, self.player_name, level, rng, telemetry)
+            replay = None
+            time_limit = f"{level['min_time_limit']}-{level['max_time_limit']}"
+            points_per_word = f"{level['min_points']}-{level['max_points']}"
+        elif self.selected_difficulty == 'daily':
+            self.daily = daily_challenge(self.corpus, path=self.daily_file)
+            session = daily_session(self.corpus, self.daily, telemetry)
+            replay = None
+            time_limit = level['time_limit']
+            points_per_word = level['points']
+        else:
+            session = GameSession(self.corpus, level, self.get_words_for_round(rng), rng, telemetry=telemetry)
+            replay = ReplayRecorder(self.corpus, self.selected_difficulty, level, seed)
+            time_limit = level['time_limit']
+            points_per_word = level['points']
+        word_count = session.total
+        difficulty_color = level['color']
+
+        self.screen.clear()
+        self.screen.print(f"{Fore.CYAN}{self.logo}")
+
+        self.screen.print(f"\n{difficulty_color}{'=' * 70}")
+        self.screen.print(
             f"{Fore.YELLOW}WORD SCRAMBLE CHALLENGE - {difficulty_color}{self.selected_difficulty.upper()}{Fore.YELLOW} MODE".center(
                 70))
-        print(f"{difficulty_color}{'=' * 70}")
-        print(f"{Fore.WHITE}Unscramble {word_count} words. {time_limit} seconds per word.")
-        print(f"{Fore.WHITE}Each correct answer: {Fore.GREEN}+{points_per_word} points{Fore.WHITE} + time bonus!")
-        print(f"{difficulty_color}{'=' * 70}")
+        self.screen.print(f"{difficulty_color}{'=' * 70}")
+        self.screen.print(f"{Fore.WHITE}Unscramble {word_count} words. {time_limit} seconds per word.")
+        self.screen.print(f"{Fore.WHITE}Each correct answer: {Fore.GREEN}+{points_per_word} points{Fore.WHITE} + time bonus!")
+        self.screen.print(f"{difficulty_color}{'=' * 70}")
 
-        input(f"\n{Fore.CYAN}Press Enter to start the challenge...{Style.RESET_ALL}")
-        print(f"\n{Fore.YELLOW}Get ready, {self.player_name}!")
+        self.screen.input(f"\n{Fore.CYAN}Press Enter to start the challenge...{Style.RESET_ALL}")
+        self.screen.print(f"\n{Fore.YELLOW}Get ready, {self.player_name}!")
         self.display_countdown(3)
 
-        for i, word in enumerate(words, 1):
-            scrambled = self.scramble_word(word)
+        while not session.finished:
+            puzzle = session.next_puzzle()
+            scrambled = puzzle.scrambled
 
-            print(f"\n{difficulty_color}{'─' * 40}")
-            print(f"{difficulty_color}┌{'─' * (len(scrambled) + 18)}┐")
-            print(
-                f"{difficulty_color}│ {Fore.WHITE}Word {i}/{word_count}: {Fore.YELLOW}{scrambled.upper()} {difficulty_color}│")
-            print(f"{difficulty_color}└{'─' * (len(scrambled) + 18)}┘")
+            self.screen.print(f"\n{difficulty_color}{'─' * 40}")
+            scrambled_width = display_width(scrambled.upper())
+            self.screen.print(f"{difficulty_color}┌{'─' * (scrambled_width + 18)}┐")
+            self.screen.print(
+                f"{difficulty_color}│ {Fore.WHITE}Word {puzzle.number}/{puzzle.total}: {Fore.YELLOW}{scrambled.upper()} {difficulty_color}│")
+            self.screen.print(f"{difficulty_color}└{'─' * (scrambled_width + 18)}┘")
 
-            print(f"{Fore.GREEN}⏱️ Time: {time_limit} seconds")
+            self.screen.print(f"{Fore.GREEN}⏱️ Time: {puzzle.time_limit} seconds  {Fore.WHITE}(type ? for a hint)")
 
             start_time = time.time()
+            answer = self.read_answer(session, puzzle, start_time)
 
-            print(f"{Fore.CYAN}Your answer: {Fore.WHITE}", end='', flush=True)
-            answer = input()
-
-            elapsed = time.time() - start_time
-            time_remaining = max(0, time_limit - int(elapsed))
+            elapsed_ms = round((time.time() - start_time) * 1000)
+            hints_used = session.hints_used
+            verdict = session.submit(answer, elapsed_ms / 1000)
+            if replay is not None:
+                replay.add(puzzle.word, answer, elapsed_ms, hints_used)
+            self.score = session.score
 
-            if elapsed >= time_limit:
-                print(f"\n{Fore.RED}⏰ Time's up! {Fore.WHITE}The word was: {Fore.YELLOW}{word.upper()}")
+            if verdict.timed_out:
+                self.screen.print(f"\n{Fore.RED}⏰ Time's up! {Fore.WHITE}The word was: {Fore.YELLOW}{verdict.word.upper()}")
                 continue
 
-            if answer.lower() == word.lower():
-                time_bonus = max(0, int((time_limit - elapsed) / 5))
-                round_score = points_per_word + time_bonus
-                self.score += round_score
-
+            if verdict.correct:
                 self.display_answer_box(answer, True)
-                print(
-                    f"{Fore.WHITE}+{points_per_word} points + {time_bonus} time bonus = {Fore.YELLOW}+{round_score} points{Fore.WHITE}")
-                print(f"{Fore.CYAN}Current Score: {Fore.YELLOW}{self.score}")
+                hint_text = f" - {verdict.hint_cost} for hints" if verdict.hint_cost else ""
+                self.screen.print(
+                    f"{Fore.WHITE}+{verdict.points} points + {verdict.time_bonus} time bonus{hint_text} = {Fore.YELLOW}+{verdict.round_score} points{Fore.WHITE}")
+                self.screen.print(f"{Fore.CYAN}Current Score: {Fore.YELLOW}{self.score}")
             else:
-                self.display_answer_box(answer, False, word)
+                self.display_answer_box(answer, False, verdict.word)
 
-        print(f"\n{Fore.GREEN}{'=' * 70}")
-        print(f"{Fore.YELLOW}🎮 GAME COMPLETE! 🎮".center(70))
-        print(f"{Fore.GREEN}{'=' * 70}")
+        self.screen.print(f"\n{Fore.GREEN}{'=' * 70}")
+        self.screen.print(f"{Fore.YELLOW}🎮 GAME COMPLETE! 🎮".center(70))
+        self.screen.print(f"{Fore.GREEN}{'=' * 70}")
 
         self.display_animated_text(f"Final Score: {self.score} points!", 0.05, Fore.YELLOW)
 
-        print(f"\n{Fore.CYAN}Difficulty: {difficulty_color}{self.selected_difficulty.capitalize()}")
-        print(f"{Fore.CYAN}Words attempted: {Fore.WHITE}{word_count}")
+        self.screen.print(f"\n{Fore.CYAN}Difficulty: {difficulty_color}{self.selected_difficulty.capitalize()}")
+        self.screen.print(f"{Fore.CYAN}Words attempted: {Fore.WHITE}{word_count}")
+        if self.selected_difficulty == 'adaptive':
+            self.screen.print(f"{Fore.CYAN}Rating: {Fore.WHITE}{round(session.rating)} ({session.rating_change:+d})")
+        elif replay is not None:
+            append_replay(self.replays_file, replay.encode(session.score))
+
+        self.update_leaderboard()
+
+    def render_blitz_word(self, word, scrambled):
+        # Runs on the prefetch thread, so the frame is ready before the
+        # previous word is answered.
+        color = self.difficulty_levels['blitz']['color']
+        scrambled = scrambled.upper()
+        width = display_width(scrambled) + 4
+        return (f"{color}┌{'─' * width}┐\n"
+                f"{color}│  {Fore.YELLOW}{scrambled}  {color}│\n"
+                f"{color}└{'─' * width}┘")
+
+    def read_answer(self, session, puzzle, start_time, waiting=None):
+        # Prompts until the player answers or the word's time runs out; a `?`
+        # shows the next hint instead. `waiting` is called whenever the game
+        # starts waiting for the player.
+        while True:
+            self.screen.flush()
+            if waiting is not None:
+                waiting()
+            answer = input_with_timeout(f"{Fore.CYAN}Your answer: {Fore.WHITE}",
+                                        start_time + puzzle.time_limit - time.time())
+            if answer is None or answer.strip() != '?':
+                return answer
+            kind = session.next_hint()
+            if kind is None:
+                self.screen.print(f"{Fore.RED}No hints left for this word.")
+                continue
+            session.use_hint(kind)
+            self.screen.print(f"{Fore.MAGENTA}💡 {self.hints.hint(kind, puzzle.word)} "
+                              f"{Fore.WHITE}(-{HINT_COSTS[kind]} points)")
+
+    def play_blitz(self):
+        self.score = 0
+        level = self.difficulty_levels['blitz']
+        color = level['color']
+        session = BlitzSession(self.corpus, level, random.Random(new_seed()),
+                               self.telemetry.bind(difficulty='blitz', player=self.player_name),
+                               render=self.render_blitz_word)
+
+        self.screen.clear()
+        self.screen.print(f"{Fore.CYAN}{self.logo}")
+        self.screen.print(f"\n{color}{'=' * 70}")
+        self.screen.print(f"{Fore.YELLOW}WORD SCRAMBLE CHALLENGE - {color}BLITZ{Fore.YELLOW} MODE".center(70))
+        self.screen.print(f"{color}{'=' * 70}")
+        self.screen.print(f"{Fore.WHITE}Solve as many words as you can in {level['duration']} seconds.")
+        self.screen.print(f"{Fore.WHITE}Each correct answer: {Fore.GREEN}+{level['points']} points{Fore.WHITE} + time bonus!")
+        self.screen.print(f"{color}{'=' * 70}")
+
+        self.screen.input(f"\n{Fore.CYAN}Press Enter to start the clock...{Style.RESET_ALL}")
+        self.screen.print(f"\n{Fore.YELLOW}Get ready, {self.player_name}!")
+        self.display_countdown(3)
+
+        solved = 0
+        session.start()
+        try:
+            while not session.finished:
+                puzzle = session.next_puzzle()
+                self.screen.print(f"\n{Fore.WHITE}Word {puzzle.number}  {Fore.GREEN}⏱️ {session.remaining:.0f} s left  "
+                                  f"{Fore.CYAN}Score: {Fore.YELLOW}{self.score}  {Fore.WHITE}(type ? for a hint)")
+                self.screen.print(session.frame)
+
+                start_time = time.time()
+                answer = self.read_answer(session, puzzle, start_time, session.prefetch)
+                verdict = session.submit(answer, time.time() - start_time)
+                self.score = session.score
+
+                if verdict.timed_out:
+                    self.screen.print(f"{Fore.RED}⏰ Time's up! {Fore.WHITE}The word was: {Fore.YELLOW}{verdict.word.upper()}")
+                elif verdict.correct:
+                    solved += 1
+                    hint_text = f" (-{verdict.hint_cost} for hints)" if verdict.hint_cost else ""
+                    self.screen.print(f"{Fore.GREEN}✓ +{verdict.round_score}{hint_text}")
+                else:
+                    self.screen.print(f"{Fore.RED}✗ {Fore.WHITE}It was {Fore.YELLOW}{verdict.word.upper()}")
+        finally:
+            session.close()
+
+        self.screen.print(f"\n{Fore.GREEN}{'=' * 70}")
+        self.screen.print(f"{Fore.YELLOW}🎮 BLITZ COMPLETE! 🎮".center(70))
+        self.screen.print(f"{Fore.GREEN}{'=' * 70}")
+
+        self.display_animated_text(f"Final Score: {self.score} points!", 0.05, Fore.YELLOW)
+        self.screen.print(f"\n{Fore.CYAN}Words solved: {Fore.WHITE}{solved} of {session.position}")
 
         self.update_leaderboard()
 
     def display_instructions(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print(f"{Fore.CYAN}{self.logo}")
+        self.screen.clear()
+        self.screen.print(f"{Fore.CYAN}{self.logo}")
 
-        print(f"\n{Fore.YELLOW}{'=' * 70}")
-        print(f"{Fore.YELLOW}HOW TO PLAY WORD SCRAMBLE CHALLENGE".center(70))
-        print(f"{Fore.YELLOW}{'=' * 70}")
+        self.screen.print(f"\n{Fore.YELLOW}{'=' * 70}")
+        self.screen.print(f"{Fore.YELLOW}HOW TO PLAY WORD SCRAMBLE CHALLENGE".center(70))
+        self.screen.print(f"{Fore.YELLOW}{'=' * 70}")
 
         instructions = [
             f"{Fore.GREEN}1.{Fore.WHITE} Words will appear with their letters scrambled",
             f"{Fore.GREEN}2.{Fore.WHITE} Type the correct unscrambled word before time runs out",
             f"{Fore.GREEN}3.{Fore.WHITE} You earn points for each correct answer",
             f"{Fore.GREEN}4.{Fore.WHITE} You get bonus points for answering quickly",
-            f"{Fore.GREEN}5.{Fore.WHITE} Try to get the highest score and top the leaderboard!"
+            f"{Fore.GREEN}5.{Fore.WHITE} Stuck? Type ? for a hint - each one costs a few points",
+            f"{Fore.GREEN}6.{Fore.WHITE} Try to get the highest score and top the leaderboard!"
         ]
 
         for instruction in instructions:
-            time.sleep(0.3)
-            print(instruction)
+            self.screen.pause(0.3)
+            self.screen.print(instruction)
 
-        print(f"{Fore.YELLOW}{'=' * 70}")
+        self.screen.print(f"{Fore.YELLOW}{'=' * 70}")
 
-        print(f"\n{Fore.CYAN}Example:")
-        print(f"{Fore.WHITE}If you see: {Fore.YELLOW}ESDTU")
-        print(f"{Fore.WHITE}You should type: {Fore.GREEN}DUETS")
+        self.screen.print(f"\n{Fore.CYAN}Example:")
+        self.screen.print(f"{Fore.WHITE}If you see: {Fore.YELLOW}ESDTU")
+        self.screen.print(f"{Fore.WHITE}You should type: {Fore.GREEN}DUETS")
 
-        print(f"\n{Fore.CYAN}Scoring:")
-        print(f"{Fore.WHITE}Correct answer: {Fore.GREEN}+10-30 points {Fore.WHITE}(depends on difficulty)")
-        print(f"{Fore.WHITE}Speed bonus: {Fore.GREEN}Up to +12 points {Fore.WHITE}for quick answers")
+        self.screen.print(f"\n{Fore.CYAN}Scoring:")
+        levels = self.difficulty_levels.values()
+        fewest = min(level['point_range'][0] for level in levels)
+        most = max(level['point_range'][1] for level in levels)
+        points = f"+{fewest}" if fewest == most else f"+{fewest}-{most}"
+        self.screen.print(f"{Fore.WHITE}Correct answer: {Fore.GREEN}{points} points {Fore.WHITE}(depends on difficulty)")
+        self.screen.print(f"{Fore.WHITE}Speed bonus: {Fore.GREEN}Up to +{max(level['max_bonus'] for level in levels)} points "
+                          f"{Fore.WHITE}for quick answers")
 
-        print(f"\n{Fore.CYAN}Difficulty Levels:")
-        print(f"{Fore.GREEN}Easy:{Fore.WHITE} Shorter words, more time")
-        print(f"{Fore.YELLOW}Medium:{Fore.WHITE} Medium words, moderate time")
-        print(f"{Fore.RED}Hard:{Fore.WHITE} Longer words, less time")
+        self.screen.print(f"\n{Fore.CYAN}Difficulty Levels:")
+        for level in self.difficulty_levels.values():
+            self.screen.print(f"{level['color']}{level['label']}:{Fore.WHITE} {level['description']}")
 
     def display_exit_screen(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.screen.clear()
 
         goodbye_art = f"""
         {Fore.CYAN}
@@ -382,17 +579,16 @@ class WordScrambleGame:
                                                                        |___/          |___/   
         """
 
-        print(goodbye_art)
-        print(f"\n{Fore.YELLOW}Thanks for playing Word Scramble Challenge, {self.player_name}!")
-        print(f"\n{Fore.WHITE}We hope to see you again soon!")
-        print(f"\n{Fore.CYAN}Your highest score: {Fore.GREEN}{self.get_player_high_score()}")
+        self.screen.print(goodbye_art)
+        self.screen.print(f"\n{Fore.YELLOW}Thanks for playing Word Scramble Challenge, {self.player_name}!")
+        self.screen.print(f"\n{Fore.WHITE}We hope to see you again soon!")
+        self.screen.print(f"\n{Fore.CYAN}Your highest score: {Fore.GREEN}{self.get_player_high_score()}")
 
-        time.sleep(2)
+        self.screen.pause(2)
 
-    def get_player_high_score(self):
-        leaderboard = self.load_leaderboard()
-        player_scores = [entry['score'] for entry in leaderboard if entry['name'] == self.player_name]
-        return max(player_scores) if player_scores else 0
+    def get_player_high_score(self, board=ALL_BOARD):
+        self.scores.refresh()
+        return self.scores.best(self.player_name, board)
 
     def display_main_menu(self):
         menu_items = [
@@ -403,142 +599,193 @@ class WordScrambleGame:
         ]
 
         for item in menu_items:
-            time.sleep(0.1)
-            print(item)
+            self.screen.pause(0.1)
+            self.screen.print(item)
     def display_answer_box(self, answer, is_correct, correct_word=None):
-        box_width = max(len(answer), len(correct_word) if correct_word else 0) + 10
+        answer_width = display_width(answer.upper())
+        word_width = display_width(correct_word.upper()) if correct_word else 0
+        box_width = max(answer_width, word_width) + 10
 
         if is_correct:
-           print(f"\n{Fore.GREEN}┌{'─' * box_width}┐")
-           print(f"{Fore.GREEN}│ {Fore.WHITE}Your answer: {Fore.YELLOW}{answer.upper()}{' ' * (box_width - 14 - len(answer))} {Fore.GREEN}│")
-           print(f"{Fore.GREEN}│ {Fore.GREEN}✓ CORRECT! {' ' * (box_width - 11)} {Fore.GREEN}│")
-           print(f"{Fore.GREEN}└{'─' * box_width}┘")
+           self.screen.print(f"\n{Fore.GREEN}┌{'─' * box_width}┐")
+           self.screen.print(f"{Fore.GREEN}│ {Fore.WHITE}Your answer: {Fore.YELLOW}{answer.upper()}{' ' * (box_width - 14 - answer_width)} {Fore.GREEN}│")
+           self.screen.print(f"{Fore.GREEN}│ {Fore.GREEN}✓ CORRECT! {' ' * (box_width - 11)} {Fore.GREEN}│")
+           self.screen.print(f"{Fore.GREEN}└{'─' * box_width}┘")
         else:
-           print(f"\n{Fore.RED}┌{'─' * box_width}┐")
-           print(f"{Fore.RED}│ {Fore.WHITE}Your answer: {Fore.YELLOW}{answer.upper()}{' ' * (box_width - 14 - len(answer))} {Fore.RED}│")
-           print(f"{Fore.RED}│ {Fore.RED}✗ WRONG! {' ' * (box_width - 9)} {Fore.RED}│")
+           self.screen.print(f"\n{Fore.RED}┌{'─' * box_width}┐")
+           self.screen.print(f"{Fore.RED}│ {Fore.WHITE}Your answer: {Fore.YELLOW}{answer.upper()}{' ' * (box_width - 14 - answer_width)} {Fore.RED}│")
+           self.screen.print(f"{Fore.RED}│ {Fore.RED}✗ WRONG! {' ' * (box_width - 9)} {Fore.RED}│")
         if correct_word:
-            print(f"{Fore.RED}│ {Fore.WHITE}Correct word: {Fore.YELLOW}{correct_word.upper()}{' ' * (box_width - 16 - len(correct_word))} {Fore.RED}│")
-        print(f"{Fore.RED}└{'─' * box_width}┘")
+            self.screen.print(f"{Fore.RED}│ {Fore.WHITE}Correct word: {Fore.YELLOW}{correct_word.upper()}{' ' * (box_width - 16 - word_width)} {Fore.RED}│")
+        self.screen.print(f"{Fore.RED}└{'─' * box_width}┘")
 
     def simple_input_box(self, prompt, width=40):
           box_width = max(width, len(prompt) + 4)
 
-          print(f"{Fore.CYAN}┌{'─' * box_width}┐")
-          print(f"{Fore.CYAN}│ {Fore.WHITE}{prompt}{' ' * (box_width - len(prompt) - 2)}{Fore.CYAN}│")
-          print(f"{Fore.CYAN}└{'─' * box_width}┘")
+          self.screen.print(f"{Fore.CYAN}┌{'─' * box_width}┐")
+          self.screen.print(f"{Fore.CYAN}│ {Fore.WHITE}{prompt}{' ' * (box_width - len(prompt) - 2)}{Fore.CYAN}│")
+          self.screen.print(f"{Fore.CYAN}└{'─' * box_width}┘")
 
-          print(f"\033[1A\033[{len(prompt) + 3}C", end="", flush=True)
+          self.screen.print(f"\033[1A\033[{len(prompt) + 3}C", end="")
 
-          answer = input()
+          answer = self.screen.input()
 
-          print()
+          self.screen.print()
 
           return answer
 
     def start_game(self):
-        if not HAS_COLORS:
-            print("For the best experience, install colorama:")
-            print("pip install colorama")
-            print("Continuing with limited styling...\n")
-            time.sleep(2)
+        if not load_colorama():
+            self.screen.print("For the best experience, install colorama:")
+            self.screen.print("pip install colorama")
+            self.screen.print("Continuing with limited styling...\n")
 
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.screen.clear()
 
         for line in self.logo.split('\n'):
-            print(f"{Fore.CYAN}{line}")
-            time.sleep(0.05)
+            self.screen.print(f"{Fore.CYAN}{line}")
+            self.screen.pause(0.05)
 
-        print(f"\n{Fore.YELLOW}{'=' * 70}")
-        print(f"{Fore.YELLOW}WELCOME TO WORD SCRAMBLE CHALLENGE".center(70))
-        print(f"{Fore.YELLOW}{'=' * 70}")
+        self.screen.print(f"\n{Fore.YELLOW}{'=' * 70}")
+        self.screen.print(f"{Fore.YELLOW}WELCOME TO WORD SCRAMBLE CHALLENGE".center(70))
+        self.screen.print(f"{Fore.YELLOW}{'=' * 70}")
 
         while True:
-            self.player_name = input(f"\n{Fore.CYAN}Enter your name: {Fore.WHITE}").strip()
+            self.player_name = self.screen.input(f"\n{Fore.CYAN}Enter your name: {Fore.WHITE}").strip()
             if self.player_name:
                 break
-            print(f"{Fore.RED}Please enter a valid name.")
+            self.screen.print(f"{Fore.RED}Please enter a valid name.")
 
         while True:
-            os.system('cls' if os.name == 'nt' else 'clear')
+            self.screen.clear()
 
-            print(f"{Fore.CYAN}{self.logo}")
+            self.screen.print(f"{Fore.CYAN}{self.logo}")
 
-            print(f"\n{Fore.YELLOW}{'=' * 70}")
-            print(f"{Fore.YELLOW}WORD SCRAMBLE CHALLENGE - Player: {Fore.WHITE}{self.player_name}".center(70))
-            print(f"{Fore.YELLOW}{'=' * 70}")
+            self.screen.print(f"\n{Fore.YELLOW}{'=' * 70}")
+            self.screen.print(f"{Fore.YELLOW}WORD SCRAMBLE CHALLENGE - Player: {Fore.WHITE}{self.player_name}".center(70))
+            self.screen.print(f"{Fore.YELLOW}{'=' * 70}")
 
             self.display_main_menu()
 
-            choice = input(f"\n{Fore.CYAN}Enter your choice (1-4): {Fore.WHITE}").strip()
+            choice = self.screen.input(f"\n{Fore.CYAN}Enter your choice (1-4): {Fore.WHITE}").strip()
 
             if choice == '1':
                 self.select_difficulty()
                 self.play_round()
-                input(f"\n{Fore.CYAN}Press Enter to continue...{Style.RESET_ALL}")
+                self.screen.input(f"\n{Fore.CYAN}Press Enter to continue...{Style.RESET_ALL}")
             elif choice == '2':
-                self.display_leaderboard()
-                input(f"\n{Fore.CYAN}Press Enter to continue...{Style.RESET_ALL}")
+                board = ALL_BOARD
+                while board:
+                    self.display_leaderboard(board)
+                    boards = '/'.join(self.scores.boards()) or ALL_BOARD
+                    board = self.screen.input(f"\n{Fore.CYAN}Show another board ({boards}) or press Enter to continue: "
+                                  f"{Style.RESET_ALL}").strip().lower()
             elif choice == '3':
                 self.display_instructions()
-                input(f"\n{Fore.CYAN}Press Enter to continue...{Style.RESET_ALL}")
+                self.screen.input(f"\n{Fore.CYAN}Press Enter to continue...{Style.RESET_ALL}")
             elif choice == '4':
                 self.display_exit_screen()
                 break
             else:
-                print(f"{Fore.RED}Invalid choice. Please enter 1, 2, 3, or 4.")
-
-
-def input_with_timeout(prompt, timeout):
-    import sys
-    import select
-
-    if os.name == 'nt':
-        import msvcrt
-        start_time = time.time()
-        sys.stdout.write(prompt)
+                self.screen.print(f"{Fore.RED}Invalid choice. Please enter 1, 2, 3, or 4.")
+
+        self.screen.flush()
+
+
+def _windows_readline(timeout):
+    import ctypes
+    import msvcrt
+
+    # The console input handle is signalled whenever input events are
+    # pending, so waiting on it sleeps until a key arrives or the deadline.
+    kernel32 = ctypes.windll.kernel32
+    handle = msvcrt.get_osfhandle(sys.stdin.fileno())
+    deadline = time.monotonic() + timeout
+    chars = []
+    while True:
+        while msvcrt.kbhit():
+            char = msvcrt.getwche()
+            if char in '\r\n':
+                sys.stdout.write('\n')
+                return ''.join(chars)
+            elif char == '\b':
+                if chars:
+                    chars.pop()
+                    sys.stdout.write(' \b')
+            else:
+                chars.append(char)
         sys.stdout.flush()
 
-        input_str = ''
-        while True:
-            if msvcrt.kbhit():
-                char = msvcrt.getche().decode('utf-8')
-                if char == '\r':  
-                    sys.stdout.write('\n')
-                    return input_str
-                elif char == '\b':  
-                    if input_str:
-                        input_str = input_str[:-1]
-                        sys.stdout.write(' \b')  
-                else:
-                    input_str += char
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        if kernel32.WaitForSingleObject(handle, int(remaining * 1000) + 1) == 0 and not msvcrt.kbhit():
+            # Only focus/mouse/key-up events are queued; drop them or the
+            # handle stays signalled.
+            kernel32.FlushConsoleInputBuffer(handle)
+
 
-            if time.time() - start_time > timeout:
-                continue 
-            time.sleep(0.1)
+def input_with_timeout(prompt, timeout):
+    # Returns the typed line, or None once `timeout` seconds pass without a
+    # complete answer. The process sleeps until input or the deadline, for
+    # piped input as much as for a terminal.
+    print(prompt, end='', flush=True)
+
+    reader = stdin_reader()
+    if reader is None:
+        line = _windows_readline(max(0, timeout))
+    elif os.name == 'nt':
+        # select() only takes sockets on Windows, so a pipe is read without
+        # a deadline; the caller still checks the elapsed time.
+        line = reader.readline()
     else:
-        print(prompt, end='', flush=True)
-        start_time = time.time()
-        input_str = ''
+        line = reader.readline(max(0, timeout))
+        if line is None and sys.stdin.isatty():
+            import termios
 
-        while True:
-            rlist, _, _ = select.select([sys.stdin], [], [], 0.1)  
-            if rlist:
-                char = sys.stdin.read(1)
-                if char == '\n':
-                    return input_str
-                else:
-                    input_str += char
-                    print(char, end='', flush=True)
-            if time.time() - start_time > timeout:
-                continue  
-            time.sleep(0.1)
+            # Discard the half-typed answer so it does not leak into the
+            # next prompt.
+            termios.tcflush(sys.stdin, termios.TCIFLUSH)
+
+    if line is None:
+        print()
+    return line
 
 
 if __name__ == "__main__":
+    import argparse
+
     try:
-        game = WordScrambleGame()
-        game.start_game()
+        parser = argparse.ArgumentParser(description="Word Scramble Challenge")
+        parser.add_argument('word_file', nargs='?',
+                            help="dictionary file with one word per line (defaults to the built-in list)")
+        parser.add_argument('--fast', action='store_const', dest='animation', const=0.0, default=1.0,
+                            help="skip all cosmetic animations and pauses")
+        parser.add_argument('--animation', type=float, dest='animation',
+                            help="scale animation delays (1 = normal, 0 = off)")
+        parser.add_argument('--telemetry', metavar='PATH',
+                            help="append timing and answer events to a JSONL file")
+        parser.add_argument('--language', default=DEFAULT_LANGUAGE,
+                            help="play with the word list in words/<language>.txt (e.g. de, fr, es, ru)")
+        parser.add_argument('--tiers', default=TIERS_FILE, metavar='PATH',
+                            help="JSON file defining the difficulty tiers (default: tiers.json)")
+        args = parser.parse_args()
+        try:
+            tiers = load_tiers(args.tiers)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+
+        telemetry = Telemetry(JsonlSink(args.telemetry)) if args.telemetry else NULL_TELEMETRY
+        game = WordScrambleGame(args.word_file, args.animation, telemetry, args.language, tiers)
+        try:
+            game.compiled_tiers
+        except ValueError as error:
+            parser.error(f"{args.tiers}: {error}")
+        try:
+            game.start_game()
+        finally:
+            game.close()
+            telemetry.close()
     except KeyboardInterrupt:
         print(f"\n\n{Fore.YELLOW}Game interrupted. Thanks for playing!")
     except Exception as e:
@@ -0,0 +1,56 @@
+from collections import OrderedDict, namedtuple
+
+from corpus import graphemes
+
+WordHints = namedtuple('WordHints', 'first letter_position letter anagrams')
+
+
+def letter_position(letters):
+    # The first letter after the first that appears only once in the word,
+    # so revealing it pins down exactly one spot.
+    for position in range(1, len(letters)):
+        if letters.count(letters[position]) == 1:
+            return position
+    return min(1, len(letters) - 1)
+
+
+class HintCache:
+    # Hint data per word, worked out on first request and kept for the most
+    # recently used `size` words. Serving a hint is then a dict lookup no
+    # matter how large the corpus is, and memory stays bounded.
+    def __init__(self, corpus, size=10000):
+        self.corpus = corpus
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, word):
+        entry = self._entries.get(word)
+        if entry is not None:
+            self._entries.move_to_end(word)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        letters = graphemes(word)
+        position = letter_position(letters)
+        entry = WordHints(letters[0], position, letters[position], len(self.corpus.anagrams.anagrams(word)) or 1)
+        self._entries[word] = entry
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def hint(self, kind, word):
+        entry = self.lookup(word)
+        if kind == 'first':
+            return f"It starts with '{entry.first.upper()}'"
+        if kind == 'letter':
+            return f"Letter {entry.letter_position + 1} is '{entry.letter.upper()}'"
+        if kind == 'anagrams':
+            if entry.anagrams == 1:
+                return "Only one word fits these letters"
+            return f"{entry.anagrams} different words fit these letters"
+        raise ValueError(f"unknown hint '{kind}'")
@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import random
+import time
+
+from corpus import load_corpus
+from server import raise_file_limit
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def run_client(args, corpus, rng, latencies, totals):
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    await reader.readline()
+
+    for _ in range(args.rounds):
+        writer.write(f"PLAY {args.difficulty} bot\n".encode())
+        while True:
+            fields = (await reader.readline()).decode().split()
+            if not fields or fields[0] == 'ERROR':
+                raise ConnectionError(f"server error: {' '.join(fields)}")
+            if fields[0] == 'END':
+                totals['games'] += 1
+                break
+            if fields[0] != 'WORD':
+                continue
+
+            number, scrambled = fields[1], fields[3]
+            await asyncio.sleep(rng.uniform(0, 2 * args.think))
+            solutions = corpus.anagrams.anagrams(scrambled)
+            if solutions and rng.random() < args.accuracy:
+                answer = solutions[0]
+            else:
+                answer = scrambled
+
+            sent = time.perf_counter()
+            writer.write(f"ANSWER {number} {answer}\n".encode())
+            verdict = (await reader.readline()).decode().split()
+            latencies.append(time.perf_counter() - sent)
+            totals[verdict[0] if verdict else 'DISCONNECTED'] += 1
+
+    writer.write(b"QUIT\n")
+    writer.close()
+
+
+async def run(args):
+    corpus = load_corpus(args.word_file)
+    corpus.anagrams
+    rng = random.Random(args.seed)
+    latencies = []
+    totals = {'games': 0, 'CORRECT': 0, 'WRONG': 0, 'TIMEOUT': 0, 'DISCONNECTED': 0}
+
+    start = time.perf_counter()
+    clients = []
+    for _ in range(args.clients):
+        clients.append(asyncio.ensure_future(run_client(args, corpus, rng, latencies, totals)))
+        await asyncio.sleep(args.ramp / args.clients)
+    results = await asyncio.gather(*clients, return_exceptions=True)
+    duration = time.perf_counter() - start
+
+    failures = [result for result in results if isinstance(result, BaseException)]
+    latencies.sort()
+    print(f"clients:           {args.clients:,} ({len(failures)} failed)")
+    print(f"games finished:    {totals['games']:,} in {duration:.1f} s")
+    print(f"answers:           {len(latencies):,} ({len(latencies) / duration:,.0f}/s)")
+    print(f"verdicts:          {totals['CORRECT']:,} correct, {totals['WRONG']:,} wrong, "
+          f"{totals['TIMEOUT']:,} timeout")
+    print(f"answer->verdict:   p50 {percentile(latencies, 0.50) * 1000:.2f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms, max {latencies[-1] * 1000 if latencies else 0:.2f} ms")
+    if failures:
+        print(f"first failure:     {failures[0]!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the Word Scramble server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=1, help="games played per client")
+    parser.add_argument('--difficulty', default='easy')
+    parser.add_argument('--think', type=float, default=0.5, help="mean seconds before answering")
+    parser.add_argument('--accuracy', type=float, default=0.8)
+    parser.add_argument('--ramp', type=float, default=2.0, help="seconds over which clients connect")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--word-file', help="same dictionary the server was started with")
+    args = parser.parse_args()
+
+    raise_file_limit()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import random
+import threading
+from collections import deque
+
+from corpus import graphemes
+from engine import MAX_SCRAMBLE_ATTEMPTS, level_selection, scramble_word
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+def _scramble_group_numpy(words, corpus, generator):
+    # All words in a group have the same length, so they stack into one
+    # (n, length) array of code points. A random key per cell argsorted along
+    # each row gives an independent permutation per word in one call, and
+    # "same as the original" is a vectorised row comparison. Only words with
+    # dictionary anagrams need a per-word check for "is another real word".
+    length = len(words[0])
+    original = np.frombuffer(''.join(words).encode('utf-32-le'), dtype='<u4').reshape(len(words), length)
+    scrambled = original.copy()
+    real_words = corpus.anagrams.ambiguous
+    ambiguous = np.array([word in real_words for word in words], dtype=bool)
+    pending = np.arange(len(words))
+
+    for _ in range(MAX_SCRAMBLE_ATTEMPTS):
+        candidates = np.take_along_axis(original[pending],
+                                        generator.random((len(pending), length)).argsort(axis=1), axis=1)
+        rejected = np.zeros(len(pending), dtype=bool)
+        if length > 2:
+            rejected = (candidates == original[pending]).all(axis=1)
+        for row in np.flatnonzero(ambiguous[pending] & ~rejected).tolist():
+            rejected[row] = candidates[row].tobytes().decode('utf-32-le') in real_words
+
+        # Keep the latest candidate even when rejected so a word that never
+        # finds a clean scramble still gets engine.scramble_word's fallback.
+        scrambled[pending] = candidates
+        pending = pending[rejected]
+        if not len(pending):
+            break
+
+    text = scrambled.tobytes().decode('utf-32-le')
+    return [text[i * length:(i + 1) * length] for i in range(len(words))]
+
+
+def batch_scramble(words, corpus, rng=random):
+    # Scramble many words at once with the same rules as
+    # engine.scramble_word. Duplicate words are scrambled once.
+    unique = list(dict.fromkeys(words))
+    if not HAS_NUMPY:
+        scrambles = {word: scramble_word(word, corpus, rng) for word in unique}
+        return [scrambles[word] for word in words]
+
+    generator = np.random.default_rng(rng.getrandbits(64))
+    groups = {}
+    scrambles = {}
+    for word in unique:
+        if word.isascii() or len(graphemes(word)) == len(word):
+            groups.setdefault(len(word), []).append(word)
+        else:
+            # Letters with combining marks have to move as one unit.
+            scrambles[word] = scramble_word(word, corpus, rng)
+
+    for group in groups.values():
+        scrambles.update(zip(group, _scramble_group_numpy(group, corpus, generator)))
+    return [scrambles[word] for word in words]
+
+
+class PuzzlePool:
+    # Ready-made (word, scrambled) pairs for one difficulty level. Serving a
+    # puzzle is a deque pop; when the pool drops below the low-water mark a
+    # background thread tops it up in one batch, so shuffling never happens
+    # on the request path unless the pool is drained faster than it refills.
+    def __init__(self, corpus, level, size=5000, low_water=0.5, rng=None):
+        self.corpus = corpus
+        self.level = level
+        self.size = size
+        self.low_water = int(size * low_water)
+        self.rng = rng or random.Random()
+        self.misses = 0
+        self._puzzles = deque()
+        self._refill_lock = threading.Lock()
+        self._wanted = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._puzzles)
+
+    def refill(self):
+        with self._refill_lock:
+            selection = level_selection(self.corpus, self.level)
+            # Each batch holds distinct words; a level with fewer words than
+            # the pool size is covered by several independently shuffled
+            # batches.
+            needed = self.size - len(self._puzzles)
+            while needed > 0:
+                words = selection.sample(min(needed, selection.size), self.rng)
+                self._puzzles.extend(zip(words, batch_scramble(words, self.corpus, self.rng)))
+                needed -= len(words)
+
+    def start(self):
+        if self._thread is None:
+            self.refill()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wanted.wait()
+            self._wanted.clear()
+            self.refill()
+
+    def get(self):
+        if len(self._puzzles) <= self.low_water:
+            self._wanted.set()
+        try:
+            return self._puzzles.popleft()
+        except IndexError:
+            self.misses += 1
+            self.refill()
+            return self._puzzles.popleft()
+
+    def take(self, count):
+        # A round's worth of puzzles, avoiding repeated words where the
+        # level has enough of them.
+        puzzles = []
+        repeats = []
+        seen = set()
+        for _ in range(count * 2):
+            puzzle = self.get()
+            if puzzle[0] in seen:
+                repeats.append(puzzle)
+                continue
+            seen.add(puzzle[0])
+            puzzles.append(puzzle)
+            if len(puzzles) == count:
+                return puzzles
+        return puzzles + repeats[:count - len(puzzles)]
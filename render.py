@@ -0,0 +1,158 @@
+import os
+import sys
+import time
+import unicodedata
+
+from telemetry import NULL_TELEMETRY
+
+# Clear the screen and home the cursor without spawning a `clear`/`cls`
+# subprocess. colorama translates this on legacy Windows consoles.
+CLEAR_SCREEN = "\033[2J\033[H"
+# Ends the colors a printed piece of text set, as colorama's autoreset does
+# after every write.
+RESET = "\033[0m"
+
+
+def display_width(text):
+    # Terminal columns the text takes up: wide and fullwidth characters (CJK,
+    # most emoji) take two, combining marks and zero-width format characters
+    # take none.
+    if text.isascii():
+        return len(text)
+    width = 0
+    for char in text:
+        if unicodedata.category(char) in ('Mn', 'Me', 'Cf'):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in 'WF' else 1
+    return width
+
+
+class LineReader:
+    # Lines read from a file descriptor with os.read into a buffer of our
+    # own, so whatever has arrived but not been handed out is either here or
+    # still visible to select() - never hidden in Python's stdin buffer.
+    # Works the same on terminals and pipes.
+    def __init__(self, fd, encoding='utf-8'):
+        self.fd = fd
+        self.encoding = encoding
+        self._pending = b''
+
+    def readline(self, timeout=None):
+        # The next line without its line ending, or None once `timeout`
+        # seconds pass without a complete one. Raises EOFError at the end of
+        # input, like input().
+        import select
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while b'\n' not in self._pending:
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([self.fd], [], [], remaining)[0]:
+                    return None
+            chunk = os.read(self.fd, 65536)
+            if not chunk:
+                if not self._pending:
+                    raise EOFError
+                chunk = b'\n'
+            self._pending += chunk
+        line, _, self._pending = self._pending.partition(b'\n')
+        return line.decode(self.encoding, 'replace').rstrip('\r')
+
+
+_stdin_reader = None
+
+
+def stdin_reader():
+    # The LineReader every prompt reads stdin through, or None for a Windows
+    # console (read with msvcrt there) or a stdin without a descriptor.
+    global _stdin_reader
+    if _stdin_reader is None:
+        try:
+            fd = sys.stdin.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+        if os.name == 'nt' and sys.stdin.isatty():
+            return None
+        _stdin_reader = LineReader(fd, getattr(sys.stdin, 'encoding', None) or 'utf-8')
+    return _stdin_reader
+
+
+def enable_windows_ansi():
+    # Windows 10+ consoles understand ANSI escapes once virtual terminal
+    # processing is switched on for the output handle.
+    try:
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+    except (AttributeError, OSError):
+        pass
+
+
+class Screen:
+    # Everything printed is collected into a frame buffer that is written in
+    # one go when the program next waits - for input or for an animation
+    # delay. `animation` scales every cosmetic delay; 0 turns them all off,
+    # so whole screens go out as a single write.
+    #
+    # Each printed piece that sets a color is closed with a reset, so colors
+    # stop where they did when every print was its own autoreset write. The
+    # frame goes through sys.stdout as it is at flush time (colorama's wrapper
+    # once colorama is loaded, which converts the escapes on old Windows
+    # consoles).
+    def __init__(self, stream=None, animation=1.0, telemetry=NULL_TELEMETRY):
+        self.stream = stream
+        self.animation = animation
+        self.telemetry = telemetry
+        self._buffer = []
+        if os.name == 'nt':
+            enable_windows_ansi()
+
+    def print(self, *values, sep=' ', end='\n'):
+        text = sep.join(str(value) for value in values)
+        if '\033[' in text:
+            text += RESET
+        self._buffer.append(text + end)
+
+    def clear(self):
+        # Anything still buffered would be wiped immediately anyway.
+        self._buffer = [CLEAR_SCREEN]
+
+    def flush(self):
+        if not self._buffer:
+            return
+        started = time.perf_counter()
+        text = ''.join(self._buffer)
+        self._buffer = []
+
+        stream = self.stream or sys.stdout
+        stream.write(text)
+        stream.flush()
+
+        if self.telemetry.enabled:
+            self.telemetry.emit('render', duration=time.perf_counter() - started, chars=len(text))
+
+    def pause(self, seconds):
+        if self.animation <= 0:
+            return
+        self.flush()
+        time.sleep(seconds * self.animation)
+
+    def animate(self, text, delay=0.03, color=None):
+        prefix = color or ''
+        if self.animation <= 0:
+            self.print(f"{prefix}{text}")
+            return
+        for char in text:
+            self.print(f"{prefix}{char}", end='')
+            self.pause(delay)
+        self.print()
+
+    def input(self, prompt=''):
+        self.print(prompt, end='')
+        self.flush()
+        reader = stdin_reader()
+        return input() if reader is None else reader.readline()
@@ -0,0 +1,259 @@
+import os
+import random
+import struct
+import sys
+import time
+from collections import namedtuple
+
+from corpus import load_corpus, shared_corpus, warm_corpus
+from engine import HINT_COSTS, GameSession, words_for_round
+from tiers import TIER_RULES, shared_tier, tier_rules
+
+# A replay file is a sequence of game records, each a header followed by a
+# body. The header carries the size of the body so a reader can hop from
+# game to game without decoding it. Since version 3 the body starts with the
+# tier's name and rules, so a game is re-scored with the rules it was played
+# under whatever the tiers file says today; then comes one entry per
+# answered word.
+REPLAY_MAGIC = b'WSRP'
+REPLAY_VERSION = 3
+GAME_HEADER = struct.Struct('<4sBBIQiHI')
+# Version 1 entries have no hint bits.
+ANSWER_ENTRIES = {1: struct.Struct('<IIH'), 2: struct.Struct('<IIHB'), 3: struct.Struct('<IIHB')}
+# word_count, time_limit, points, min_score, max_score, min_length and
+# max_length (0 = no length band), then the length of the UTF-8 name.
+TIER_RECORD = struct.Struct('<HdHBBBBB')
+TIMED_OUT = 0xFFFF
+
+# Versions 1 and 2 stored only an index into the three tiers of the time,
+# played under these rules.
+LEGACY_LEVELS = (
+    ('easy', {'word_count': 10, 'time_limit': 60, 'points': 10, 'min_score': 0, 'max_score': 30}),
+    ('medium', {'word_count': 15, 'time_limit': 45, 'points': 20, 'min_score': 30, 'max_score': 60}),
+    ('hard', {'word_count': 20, 'time_limit': 30, 'points': 30, 'min_score': 60, 'max_score': 100}),
+)
+HINT_KINDS = tuple(HINT_COSTS)
+
+Replay = namedtuple('Replay', 'difficulty level fingerprint seed score answers')
+
+
+def new_seed():
+    return random.SystemRandom().getrandbits(64)
+
+
+class ReplayRecorder:
+    # Collects one seeded game as it is played. Elapsed times are whole
+    # milliseconds, and the game scores with exactly that value so a replay
+    # always reproduces the same score. `level` is the tier being played.
+    def __init__(self, corpus, difficulty, level, seed):
+        self.corpus = corpus
+        self.difficulty = difficulty
+        self.level = level
+        self.seed = seed
+        self.entries = []
+
+    def add(self, word, answer, elapsed_ms, hints=()):
+        if answer is None:
+            encoded = b''
+            length = TIMED_OUT
+        else:
+            encoded = answer.encode('utf-8')[:TIMED_OUT - 1]
+            length = len(encoded)
+        hint_bits = sum(1 << HINT_KINDS.index(kind) for kind in hints)
+        self.entries.append(ANSWER_ENTRIES[REPLAY_VERSION].pack(self.corpus.index(word), elapsed_ms, length, hint_bits)
+                            + encoded)
+
+    def encode(self, score):
+        name = self.difficulty.encode('utf-8')[:255]
+        rules = [value or 0 for value in tier_rules(self.level)]
+        body = TIER_RECORD.pack(*rules, len(name)) + name + b''.join(self.entries)
+        return GAME_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, 0, self.corpus.fingerprint(), self.seed, score,
+                                len(self.entries), len(body)) + body
+
+
+def append_replay(path, record):
+    # One write per game keeps concurrent appends from interleaving.
+    with open(path, 'ab') as file:
+        file.write(record)
+
+
+def split_replays(data, games_per_chunk):
+    # Yields (offset, bytes) chunks of whole games using only the headers.
+    # A torn record at the end of the file is yielded on its own.
+    offset = chunk_start = games = 0
+    while offset < len(data):
+        if len(data) - offset < GAME_HEADER.size:
+            break
+        size = GAME_HEADER.size + GAME_HEADER.unpack_from(data, offset)[-1]
+        if offset + size > len(data):
+            break
+        offset += size
+        games += 1
+        if games == games_per_chunk:
+            yield chunk_start, data[chunk_start:offset]
+            chunk_start = offset
+            games = 0
+    if chunk_start < offset:
+        yield chunk_start, data[chunk_start:offset]
+    if offset < len(data):
+        yield offset, data[offset:]
+
+
+def decode_replays(data):
+    offset = 0
+    while offset < len(data):
+        start = offset
+        if len(data) - offset < GAME_HEADER.size:
+            raise ValueError(f"truncated game record at byte {start}")
+        magic, version, level, fingerprint, seed, score, count, size = GAME_HEADER.unpack_from(data, offset)
+        if magic != REPLAY_MAGIC or version not in ANSWER_ENTRIES or (version < 3 and level >= len(LEGACY_LEVELS)):
+            raise ValueError(f"not a replay record at byte {start}")
+        offset += GAME_HEADER.size
+        end = offset + size
+        if end > len(data):
+            raise ValueError(f"truncated game record at byte {start}")
+        if version < 3:
+            difficulty, rules = LEGACY_LEVELS[level]
+        else:
+            if size < TIER_RECORD.size:
+                raise ValueError(f"corrupt game record at byte {start}")
+            *values, name_length = TIER_RECORD.unpack_from(data, offset)
+            offset += TIER_RECORD.size
+            difficulty = data[offset:offset + name_length].decode('utf-8', 'replace')
+            offset += name_length
+            rules = dict(zip(TIER_RULES, values))
+            if not rules['min_length']:
+                del rules['min_length'], rules['max_length']
+        entry = ANSWER_ENTRIES[version]
+        answers = []
+        for _ in range(count):
+            index, elapsed_ms, length, *hint_bits = entry.unpack_from(data, offset)
+            offset += entry.size
+            hints = tuple(kind for bit, kind in enumerate(HINT_KINDS) if hint_bits and hint_bits[0] & 1 << bit)
+            if length == TIMED_OUT:
+                answer = None
+            else:
+                answer = data[offset:offset + length].decode('utf-8', 'replace')
+                offset += length
+            answers.append((index, elapsed_ms, answer, hints))
+        if offset != end:
+            raise ValueError(f"corrupt game record at byte {start}")
+        yield start, Replay(difficulty, rules, fingerprint, seed, score, answers)
+
+
+def verify_replay(replay, corpus):
+    # Returns None when the replay reproduces its claimed score, otherwise
+    # the reason it does not.
+    if replay.fingerprint != corpus.fingerprint():
+        return "recorded against a different word list"
+    try:
+        level = shared_tier(corpus, replay.difficulty, replay.level)
+    except ValueError as error:
+        return str(error)
+    words = words_for_round(corpus, level, random.Random(replay.seed))
+    if len(replay.answers) != len(words):
+        return f"{len(replay.answers)} answers for a {len(words)}-word round"
+
+    # Scrambles never affect the score, so the session is given the words
+    # themselves instead of spending time shuffling.
+    session = GameSession(corpus, level, words, scrambles=words)
+    for number, (word, (index, elapsed_ms, answer, hints)) in enumerate(zip(words, replay.answers), 1):
+        if index >= len(corpus) or corpus[index] != word:
+            return f"word {number} does not match the seed"
+        for kind in hints:
+            session.use_hint(kind)
+        session.submit(answer, elapsed_ms / 1000)
+    if session.score != replay.score:
+        return f"claims {replay.score} points, replays to {session.score}"
+    return None
+
+
+def verify_chunk(word_file, base, data):
+    corpus = shared_corpus(word_file)
+    checked = 0
+    failures = []
+    try:
+        for offset, replay in decode_replays(data):
+            checked += 1
+            reason = verify_replay(replay, corpus)
+            if reason is not None:
+                failures.append((base + offset, replay.seed, reason))
+    except ValueError as error:
+        failures.append((base, None, str(error)))
+    return checked, failures
+
+
+def verify_files(paths, word_file=None, workers=None, chunk_size=500):
+    # Replays are verified in chunks of whole games across a process pool.
+    # Returns {path: (games checked, [(byte offset, seed, reason), ...])}.
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=warm_corpus, initargs=(word_file,)) as pool:
+        futures = {}
+        for path in paths:
+            with open(path, 'rb') as file:
+                data = file.read()
+            futures[path] = [pool.submit(verify_chunk, word_file, offset, chunk)
+                             for offset, chunk in split_replays(data, chunk_size)]
+
+        results = {}
+        for path, path_futures in futures.items():
+            checked = 0
+            failures = []
+            for future in path_futures:
+                chunk_checked, chunk_failures = future.result()
+                checked += chunk_checked
+                failures.extend(chunk_failures)
+            results[path] = (checked, failures)
+        return results
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect and re-verify recorded Word Scramble games")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    verify_parser = commands.add_parser('verify', help="replay every game and check its score")
+    verify_parser.add_argument('paths', nargs='+', help="replay files")
+    verify_parser.add_argument('--word-file', help="dictionary the games were played with")
+    verify_parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    verify_parser.add_argument('--chunk-size', type=int, default=500, help="games per job handed to a worker")
+
+    show_parser = commands.add_parser('show', help="print the games in a replay file")
+    show_parser.add_argument('path')
+    show_parser.add_argument('--word-file', help="dictionary the games were played with")
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        corpus = load_corpus(args.word_file)
+        with open(args.path, 'rb') as file:
+            data = file.read()
+        for offset, replay in decode_replays(data):
+            print(f"@{offset} {replay.difficulty} ({replay.level['word_count']} words, "
+                  f"{replay.level['time_limit']:g} s, {replay.level['points']} points) "
+                  f"seed={replay.seed} score={replay.score}")
+            for index, elapsed_ms, answer, hints in replay.answers:
+                word = corpus[index] if index < len(corpus) else '?'
+                print(f"  {word:<20} {'(timed out)' if answer is None else answer:<20} {elapsed_ms / 1000:>8.3f} s"
+                      f"  {' '.join(hints)}")
+        return
+
+    start = time.perf_counter()
+    results = verify_files(args.paths, args.word_file, args.workers, args.chunk_size)
+    duration = time.perf_counter() - start
+    games = bad = 0
+    for path, (checked, failures) in results.items():
+        games += checked
+        bad += len(failures)
+        for offset, seed, reason in failures:
+            print(f"{path}@{offset}: seed={seed}: {reason}")
+    print(f"Verified {games:,} games in {duration:.2f} s ({games / max(duration, 1e-9):,.0f} games/s), "
+          f"{bad:,} failed")
+    if bad:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import heapq
+import json
+import os
+from contextlib import contextmanager
+
+from storage import write_atomic
+
+ALL_BOARD = 'all'
+
+# Rewrite the index snapshot once this many log entries have been appended
+# or replayed since the last one, so opening the store only replays a short
+# tail of the log. Recording never does it: the snapshot is written when the
+# store is opened or closed, or when its owner finds a quiet moment.
+CHECKPOINT_INTERVAL = 1000
+
+
+class Standings:
+    # Counts of players' best scores in a Fenwick tree indexed by score, so
+    # adding or moving a player and asking how many are ahead of a score are
+    # O(log of the top score). The tree doubles as higher scores arrive.
+    def __init__(self):
+        self.count = 0
+        self._tree = [0] * 1025
+
+    def add(self, score, delta=1):
+        index = max(0, int(score)) + 1
+        tree = self._tree
+        while index >= len(tree):
+            # A tree of size 2n keeps the first n nodes; of the new ones
+            # only node 2n (covering everything) is non-zero.
+            size = len(tree) - 1
+            tree.extend([0] * size)
+            tree[2 * size] = self.count
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+        self.count += delta
+
+    def above(self, score):
+        index = min(max(0, int(score)) + 1, len(self._tree) - 1)
+        tree = self._tree
+        at_most = 0
+        while index:
+            at_most += tree[index]
+            index -= index & -index
+        return self.count - at_most
+
+
+@contextmanager
+def locked(file):
+    # Exclusive advisory lock on an open file, held across processes.
+    if os.name == 'nt':
+        import msvcrt
+
+        file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                continue
+        try:
+            yield file
+        finally:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield file
+        finally:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class ScoreStore:
+    # Every result is appended to a JSON-lines log and never rewritten. In
+    # memory we keep, per board (one per difficulty plus ALL_BOARD, plus the
+    # entry's own 'board' if it names one), a min-heap holding the current
+    # top K and a dict of each player's best score, so recording is
+    # O(log K) and "my best score" is O(1). The heaps and dicts are
+    # checkpointed to `<log>.index` together with the log offset they cover.
+    # Standings count every player's best per board (rebuilt from the dicts
+    # on load), so any player's standing is O(log) too.
+    #
+    # Any number of processes may share one log. Appends happen under an
+    # exclusive file lock, after first replaying whatever other writers
+    # added, so every process applies entries in log order. A writer that
+    # dies mid-append leaves an unterminated line; the next writer closes it
+    # off and replay skips it.
+    #
+    # `expired(board)` names boards that are finished with (earlier days'
+    # daily boards): they are neither loaded, kept up to date nor
+    # checkpointed, and boards() leaves them out.
+    def __init__(self, path, top_k=10, legacy_path=None, expired=None):
+        self.path = path
+        self.index_path = path + '.index'
+        self.top_k = top_k
+        self.expired = expired or (lambda board: False)
+        self.entries = 0
+        self.skipped_lines = 0
+        self._boards = {}
+        self._best = {}
+        self._standings = {}
+        self._offset = 0
+        self._since_checkpoint = 0
+
+        with open(self.path, 'ab') as log, locked(log):
+            if legacy_path and os.path.exists(legacy_path) and os.path.getsize(self.path) == 0:
+                self._import_legacy(log, legacy_path)
+        self._load_index()
+        self.refresh()
+        if self.checkpoint_due:
+            self.checkpoint()
+
+    def _import_legacy(self, log, legacy_path):
+        try:
+            with open(legacy_path, 'r') as file:
+                entries = json.load(file)
+        except ValueError:
+            # Leave an unreadable legacy file in place for the user to
+            # inspect rather than treating it as an empty leaderboard.
+            return
+        log.write(b''.join(self._encode(entry) for entry in entries))
+        log.flush()
+        os.fsync(log.fileno())
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r') as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            return
+        if index.get('offset', 0) > os.path.getsize(self.path):
+            # The log was replaced or truncated; rebuild from scratch.
+            return
+        self._offset = index['offset']
+        self.entries = index['entries']
+        self.skipped_lines = index.get('skipped_lines', 0)
+        self._boards = {board: [tuple(item) for item in heap] for board, heap in index['boards'].items()
+                        if not self.expired(board)}
+        self._best = {board: best for board, best in index['best'].items() if not self.expired(board)}
+        self._standings = {}
+        for board, best in self._best.items():
+            standings = self._standings[board] = Standings()
+            for score in best.values():
+                standings.add(score)
+
+    def refresh(self):
+        # Apply complete lines appended (by anyone) since our last look.
+        with open(self.path, 'rb') as log:
+            log.seek(self._offset)
+            for line in log:
+                if not line.endswith(b'\n'):
+                    break
+                self._offset += len(line)
+                self._since_checkpoint += 1
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    self.skipped_lines += 1
+                    continue
+                self._apply(entry)
+
+    @staticmethod
+    def _encode(entry):
+        return (json.dumps(entry, separators=(',', ':')) + '\n').encode('utf-8')
+
+    def _boards_for(self, entry):
+        if 'board' in entry and not self.expired(entry['board']):
+            return ALL_BOARD, entry['difficulty'], entry['board']
+        return ALL_BOARD, entry['difficulty']
+
+    def _apply(self, entry):
+        self.entries += 1
+        item = (entry['score'], -self.entries, entry)
+        ranks = {}
+        boards = self._boards_for(entry)
+        for board in boards:
+            heap = self._boards.setdefault(board, [])
+            if len(heap) < self.top_k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+            else:
+                continue
+            ranks[board] = 1 + sum(1 for other in heap if other[:2] > item[:2])
+
+        for board in boards:
+            best = self._best.setdefault(board, {})
+            previous = best.get(entry['name'])
+            if previous is None or entry['score'] > previous:
+                best[entry['name']] = entry['score']
+                standings = self._standings.get(board)
+                if standings is None:
+                    standings = self._standings[board] = Standings()
+                if previous is not None:
+                    standings.add(previous, -1)
+                standings.add(entry['score'])
+        return ranks
+
+    def record(self, entry):
+        return self.record_many([entry])[0]
+
+    def record_many(self, entries):
+        # Group commit: one lock, one write and one fsync for the batch.
+        data = b''.join(self._encode(entry) for entry in entries)
+        with open(self.path, 'ab') as log, locked(log):
+            self.refresh()
+            if os.path.getsize(self.path) > self._offset:
+                # A crashed writer left a partial line at the end; terminate
+                # it so the batch starts on a fresh line.
+                log.write(b'\n')
+                self.skipped_lines += 1
+            log.write(data)
+            log.flush()
+            os.fsync(log.fileno())
+            self._offset = log.tell()
+        ranks = [self._apply(entry) for entry in entries]
+        self._since_checkpoint += len(entries)
+        return ranks
+
+    @property
+    def checkpoint_due(self):
+        return self._since_checkpoint >= CHECKPOINT_INTERVAL
+
+    def checkpoint(self):
+        # A long-running process sees days go by; drop what expired since.
+        for board in [board for board in self._boards if self.expired(board)]:
+            del self._boards[board]
+            self._best.pop(board, None)
+            self._standings.pop(board, None)
+        index = {
+            'offset': self._offset,
+            'entries': self.entries,
+            'skipped_lines': self.skipped_lines,
+            'boards': self._boards,
+            'best': self._best,
+        }
+        write_atomic(self.index_path, json.dumps(index, separators=(',', ':')).encode('utf-8'))
+        self._since_checkpoint = 0
+
+    def top(self, board=ALL_BOARD):
+        return [item[2] for item in sorted(self._boards.get(board, ()), key=lambda item: item[:2], reverse=True)]
+
+    def best(self, name, board=ALL_BOARD):
+        return self._best.get(board, {}).get(name, 0)
+
+    def player_rank(self, name, board=ALL_BOARD):
+        # 1 + the number of players with a better best score on the board,
+        # or None if the player has no result there.
+        score = self._best.get(board, {}).get(name)
+        if score is None:
+            return None
+        return self._standings[board].above(score) + 1
+
+    def players(self, board=ALL_BOARD):
+        standings = self._standings.get(board)
+        return standings.count if standings is not None else 0
+
+    def boards(self):
+        return sorted(board for board in self._boards if not self.expired(board))
+
+    def close(self):
+        if self.checkpoint_due:
+            self.checkpoint()
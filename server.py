@@ -0,0 +1,276 @@
+import argparse
+import asyncio
+from datetime import datetime
+
+from corpus import load_corpus
+from daily import DAILY_FILE, daily_board, daily_challenge, daily_session, stale_daily_board
+from engine import GameSession
+from hints import HintCache
+from puzzles import PuzzlePool
+from scores import ALL_BOARD, ScoreStore
+from telemetry import NULL_TELEMETRY, JsonlSink, Telemetry
+from tiers import TIERS_FILE, compile_tiers, load_tiers
+
+# Line protocol (UTF-8, one message per line):
+#
+#   server: WELCOME word-scramble 2
+#   client: PLAY <difficulty> <name>
+#   server: WORD <n> <total> <scrambled> <time_limit>
+#   client: ANSWER <n> <text>
+#         | HINT <n>               (any number of times before ANSWER)
+#   server: HINT <n> <cost> <text> | NOHINT <n>
+#   server: CORRECT <n> <round_score> <score>
+#         | WRONG <n> <word> <score>
+#         | TIMEOUT <n> <word> <score>
+#   server: END <score> <rank>     (after the last word; rank 0 = not top K,
+#                                   or the score could not be saved)
+#   client: QUIT
+#
+# A line longer than the stream limit (64 KiB) is dropped; outside a game
+# the server answers it with ERROR.
+# The deadline for each word is enforced by the event loop. Answers tagged
+# with an earlier word number (sent after a TIMEOUT) are ignored.
+#
+# `PLAY daily <name>` plays today's shared set; its END rank is the player's
+# standing among everyone who has played it today.
+PROTOCOL_VERSION = 2
+
+# Finished games are written to the score store in batches: the first result
+# waits this long for others to join it, then the whole batch shares one
+# lock and one fsync.
+GROUP_COMMIT_DELAY = 0.02
+
+
+def raise_file_limit():
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+class ScrambleServer:
+    # `levels` are compiled tiers; by default those of the tiers file.
+    def __init__(self, corpus, levels=None, scores=None, telemetry=NULL_TELEMETRY,
+                 daily_file=DAILY_FILE):
+        if levels is None:
+            levels = compile_tiers(load_tiers(), corpus)
+        self.corpus = corpus
+        self.daily_file = daily_file
+        self.telemetry = telemetry
+        self.levels = levels
+        self.scores = scores
+        self.hints = HintCache(corpus)
+        self.pools = {name: PuzzlePool(corpus, level) for name, level in levels.items()}
+        for pool in self.pools.values():
+            pool.start()
+        self.results = asyncio.Queue()
+        self.active_players = 0
+        self.games_played = 0
+
+    async def commit_results(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.results.get()]
+            await asyncio.sleep(GROUP_COMMIT_DELAY)
+            while not self.results.empty():
+                batch.append(self.results.get_nowait())
+
+            started = loop.time()
+            try:
+                ranks = await loop.run_in_executor(None, self.commit, [entry for entry, _ in batch])
+                self.telemetry.emit('leaderboard_save', duration=loop.time() - started, batch=len(batch))
+            except Exception as error:
+                # Whatever went wrong is reported to the games in this batch;
+                # the loop carries on with the next one.
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for (_, future), rank in zip(batch, ranks):
+                if not future.done():
+                    future.set_result(rank)
+
+            if self.results.empty() and self.scores.checkpoint_due:
+                # Nobody is waiting on the store right now, so snapshot its
+                # index; results that arrive meanwhile queue up as usual.
+                started = loop.time()
+                try:
+                    await loop.run_in_executor(None, self.scores.checkpoint)
+                except OSError:
+                    continue
+                self.telemetry.emit('leaderboard_checkpoint', duration=loop.time() - started)
+
+    def commit(self, entries):
+        # Runs in the executor, the only thread that touches the store. The
+        # rank reported for a game is its place on the overall board, or for
+        # a daily game the player's standing that day (0 = unranked, which
+        # includes a board that went stale at midnight).
+        ranks = []
+        for entry, board_ranks in zip(entries, self.scores.record_many(entries)):
+            if 'board' in entry:
+                ranks.append(self.scores.player_rank(entry['name'], entry['board']) or 0)
+            else:
+                ranks.append(board_ranks.get(ALL_BOARD, 0))
+        return ranks
+
+    async def record_result(self, entry):
+        # The rank END reports for the game.
+        if self.scores is None:
+            return 0
+        future = asyncio.get_running_loop().create_future()
+        self.results.put_nowait((entry, future))
+        return await future
+
+    async def handle_client(self, reader, writer):
+        self.active_players += 1
+        try:
+            writer.write(f"WELCOME word-scramble {PROTOCOL_VERSION}\n".encode())
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b"ERROR line too long\n")
+                    continue
+                if not line:
+                    break
+                command, _, rest = line.decode('utf-8', 'replace').strip().partition(' ')
+                command = command.upper()
+                if command == 'QUIT':
+                    break
+                if command != 'PLAY':
+                    writer.write(b"ERROR expected PLAY <difficulty> <name>\n")
+                    continue
+                difficulty, _, name = rest.partition(' ')
+                if difficulty not in self.levels and difficulty != 'daily':
+                    writer.write(f"ERROR unknown difficulty '{difficulty}'\n".encode())
+                    continue
+                if not await self.play(reader, writer, difficulty, name.strip() or 'anonymous'):
+                    break
+                self.games_played += 1
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.active_players -= 1
+            writer.close()
+
+    async def play(self, reader, writer, difficulty, name):
+        loop = asyncio.get_running_loop()
+        telemetry = self.telemetry.bind(difficulty=difficulty, player=name)
+        if difficulty == 'daily':
+            # Built (or loaded) once a day, then shared by every game.
+            challenge = daily_challenge(self.corpus, path=self.daily_file)
+            session = daily_session(self.corpus, challenge, telemetry)
+        else:
+            level = self.levels[difficulty]
+            puzzles = self.pools[difficulty].take(level['word_count'])
+            session = GameSession(self.corpus, level, [word for word, _ in puzzles],
+                                  scrambles=[scrambled for _, scrambled in puzzles], telemetry=telemetry)
+
+        while not session.finished:
+            puzzle = session.next_puzzle()
+            writer.write(f"WORD {puzzle.number} {puzzle.total} {puzzle.scrambled} {puzzle.time_limit}\n".encode())
+            await writer.drain()
+
+            started = loop.time()
+            deadline = started + puzzle.time_limit
+            answer = None
+            while answer is None:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    break
+                except ValueError:
+                    # Over the line limit, so not an answer to anything.
+                    continue
+                if not line:
+                    return False
+                command, number, text = (line.decode('utf-8', 'replace').strip().split(' ', 2) + ['', ''])[:3]
+                if number != str(puzzle.number):
+                    continue
+                command = command.upper()
+                if command == 'ANSWER':
+                    answer = text
+                elif command == 'HINT':
+                    kind = session.next_hint()
+                    if kind is None:
+                        writer.write(f"NOHINT {puzzle.number}\n".encode())
+                    else:
+                        cost = session.use_hint(kind)
+                        writer.write(f"HINT {puzzle.number} {cost} {self.hints.hint(kind, puzzle.word)}\n".encode())
+
+            verdict = session.submit(answer, loop.time() - started)
+            if verdict.timed_out:
+                writer.write(f"TIMEOUT {puzzle.number} {verdict.word} {verdict.score}\n".encode())
+            elif verdict.correct:
+                writer.write(f"CORRECT {puzzle.number} {verdict.round_score} {verdict.score}\n".encode())
+            else:
+                writer.write(f"WRONG {puzzle.number} {verdict.word} {verdict.score}\n".encode())
+
+        entry = {
+            'name': name,
+            'score': session.score,
+            'difficulty': difficulty,
+            'date': datetime.now().strftime("%Y-%m-%d %H:%M")
+        }
+        if difficulty == 'daily':
+            entry['board'] = daily_board(challenge.day)
+        try:
+            rank = await self.record_result(entry)
+        except Exception:
+            # The game is over either way; it just goes unranked.
+            rank = 0
+        writer.write(f"END {session.score} {rank}\n".encode())
+        await writer.drain()
+        return True
+
+
+async def serve(host, port, corpus, scores=None, telemetry=NULL_TELEMETRY, levels=None):
+    game_server = ScrambleServer(corpus, levels, scores, telemetry)
+    if scores is not None:
+        # Keep a reference so the task is not garbage collected.
+        committer = asyncio.ensure_future(game_server.commit_results())
+    server = await asyncio.start_server(game_server.handle_client, host, port, backlog=4096)
+    print(f"Word Scramble server listening on {host}:{port} ({len(corpus):,} words)")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Word Scramble multiplayer server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--word-file', help="dictionary file with one word per line")
+    parser.add_argument('--scores', default="word_scramble_scores.jsonl",
+                        help="shared score log (pass an empty string to disable)")
+    parser.add_argument('--telemetry', metavar='PATH', help="append timing and answer events to a JSONL file")
+    parser.add_argument('--tiers', default=TIERS_FILE, metavar='PATH', help="JSON file defining the difficulty tiers")
+    args = parser.parse_args()
+    try:
+        tiers = load_tiers(args.tiers)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    raise_file_limit()
+    corpus = load_corpus(args.word_file)
+    corpus.anagrams
+    try:
+        levels = compile_tiers(tiers, corpus)
+    except ValueError as error:
+        parser.error(str(error))
+    telemetry = Telemetry(JsonlSink(args.telemetry)) if args.telemetry else NULL_TELEMETRY
+    scores = ScoreStore(args.scores, expired=stale_daily_board) if args.scores else None
+    try:
+        asyncio.run(serve(args.host, args.port, corpus, scores, telemetry, levels))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if scores is not None:
+            scores.close()
+        telemetry.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus import shared_corpus, warm_corpus
+from engine import GameSession
+from tiers import TIERS_FILE, load_tiers, shared_tier
+
+# Score histograms are kept in buckets of this many points.
+BUCKET_SIZE = 10
+
+
+class PerfectSolver:
+    # Always right, answering in a fixed time.
+    def __init__(self, response_time=1.0):
+        self.response_time = response_time
+
+    def answer(self, puzzle, rng):
+        return puzzle.word, self.response_time
+
+
+class RandomSolver:
+    # Guesses a random ordering of the letters at a uniformly random time
+    # inside the limit.
+    def answer(self, puzzle, rng):
+        letters = list(puzzle.scrambled)
+        rng.shuffle(letters)
+        return ''.join(letters), rng.uniform(0, puzzle.time_limit)
+
+
+class ModeledSolver:
+    # Response times are log-normal around a median that grows with word
+    # length; the chance of solving decays with length.
+    def __init__(self, median_per_letter=1.2, sigma=0.6, accuracy=0.95, decay=0.04):
+        self.median_per_letter = median_per_letter
+        self.sigma = sigma
+        self.accuracy = accuracy
+        self.decay = decay
+
+    def answer(self, puzzle, rng):
+        length = len(puzzle.word)
+        elapsed = rng.lognormvariate(math.log(self.median_per_letter * length), self.sigma)
+        if elapsed >= puzzle.time_limit:
+            return None, elapsed
+        if rng.random() < self.accuracy * (1 - self.decay) ** length:
+            return puzzle.word, elapsed
+        return puzzle.scrambled, elapsed
+
+
+SOLVERS = {
+    'perfect': PerfectSolver,
+    'random': RandomSolver,
+    'modeled': ModeledSolver,
+}
+
+def simulate_rounds(word_file, difficulty, tier, solver_name, rounds, seed):
+    corpus = shared_corpus(word_file)
+    rng = random.Random(seed)
+    level = shared_tier(corpus, difficulty, tier)
+    solver = SOLVERS[solver_name]()
+    histogram = {}
+    correct = 0
+    words = 0
+
+    for _ in range(rounds):
+        session = GameSession(corpus, level, rng=rng)
+        while not session.finished:
+            puzzle = session.next_puzzle()
+            answer, elapsed = solver.answer(puzzle, rng)
+            if session.submit(answer, elapsed).correct:
+                correct += 1
+            words += 1
+        bucket = session.score // BUCKET_SIZE
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+
+    return difficulty, histogram, correct, words
+
+
+def merge_results(results):
+    merged = {}
+    for difficulty, histogram, correct, words in results:
+        totals = merged.setdefault(difficulty, {'histogram': {}, 'correct': 0, 'words': 0})
+        for bucket, count in histogram.items():
+            totals['histogram'][bucket] = totals['histogram'].get(bucket, 0) + count
+        totals['correct'] += correct
+        totals['words'] += words
+    return merged
+
+
+def histogram_percentile(histogram, fraction):
+    total = sum(histogram.values())
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= fraction * total:
+            return bucket * BUCKET_SIZE
+    return 0
+
+
+def print_report(merged, duration, width=40):
+    total_rounds = sum(sum(totals['histogram'].values()) for totals in merged.values())
+    print(f"Simulated {total_rounds:,} rounds in {duration:.1f} s "
+          f"({total_rounds / duration * 60:,.0f} rounds/min)\n")
+
+    for difficulty, totals in merged.items():
+        histogram = totals['histogram']
+        rounds = sum(histogram.values())
+        mean = sum((bucket * BUCKET_SIZE + BUCKET_SIZE / 2) * count for bucket, count in histogram.items()) / rounds
+        print(f"{difficulty.upper()}: {rounds:,} rounds, solve rate {totals['correct'] / totals['words']:.1%}, "
+              f"mean ~{mean:.0f}, p50 {histogram_percentile(histogram, 0.5)}, "
+              f"p90 {histogram_percentile(histogram, 0.9)}, p99 {histogram_percentile(histogram, 0.99)}")
+        peak = max(histogram.values())
+        for bucket in range(min(histogram), max(histogram) + 1):
+            count = histogram.get(bucket, 0)
+            bar = '#' * max(1 if count else 0, round(count / peak * width))
+            print(f"  {bucket * BUCKET_SIZE:>5}-{bucket * BUCKET_SIZE + BUCKET_SIZE - 1:<5} {count:>10,} {bar}")
+        print()
+
+
+def run_simulation(tiers, solver_name, rounds, word_file=None, workers=None, chunk_size=2000, seed=0):
+    # `tiers` is {name: tier} as load_tiers returns it; each worker compiles
+    # the tiers it is handed once.
+    workers = workers or os.cpu_count() or 1
+    jobs = []
+    for difficulty, tier in tiers.items():
+        for first in range(0, rounds, chunk_size):
+            jobs.append((word_file, difficulty, tier, solver_name, min(chunk_size, rounds - first),
+                         seed + len(jobs)))
+
+    with ProcessPoolExecutor(workers, initializer=warm_corpus, initargs=(word_file,)) as pool:
+        futures = [pool.submit(simulate_rounds, *job) for job in jobs]
+        return merge_results(future.result() for future in futures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play Word Scramble rounds offline with simulated solvers")
+    parser.add_argument('--rounds', type=int, default=100_000, help="rounds per difficulty")
+    parser.add_argument('--difficulty', action='append',
+                        help="tier to simulate (repeatable, default all)")
+    parser.add_argument('--solver', choices=list(SOLVERS), default='modeled')
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--chunk-size', type=int, default=2000, help="rounds per job handed to a worker")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--word-file', help="dictionary file with one word per line")
+    parser.add_argument('--tiers', default=TIERS_FILE, metavar='PATH', help="JSON file defining the difficulty tiers")
+    args = parser.parse_args()
+    try:
+        tiers = load_tiers(args.tiers)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    unknown = [name for name in args.difficulty or () if name not in tiers]
+    if unknown:
+        parser.error(f"unknown tier(s) {', '.join(unknown)} (choose from {', '.join(tiers)})")
+    if args.difficulty:
+        tiers = {name: tiers[name] for name in args.difficulty}
+
+    start = time.perf_counter()
+    try:
+        merged = run_simulation(tiers, args.solver, args.rounds, args.word_file, args.workers,
+                                args.chunk_size, args.seed)
+    except ValueError as error:
+        parser.error(f"{args.tiers}: {error}")
+    print_report(merged, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
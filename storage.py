@@ -0,0 +1,20 @@
+import os
+
+
+def write_atomic(path, data):
+    # Replace `path` with `data` (bytes) so readers see either the old file
+    # or the complete new one, never a partial write: write a per-process
+    # temporary file next to it, fsync it, then rename it over the original.
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
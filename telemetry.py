@@ -0,0 +1,161 @@
+import json
+import math
+import sys
+import time
+from collections import deque
+
+
+class JsonlSink:
+    # Appends one JSON object per line. Writes go through a regular buffered
+    # file and are flushed every `flush_every` events and on close.
+    def __init__(self, path, flush_every=100):
+        self.file = open(path, 'a', encoding='utf-8')
+        self.flush_every = flush_every
+        self._pending = 0
+
+    def write(self, event):
+        self.file.write(json.dumps(event, separators=(',', ':')) + '\n')
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.file.flush()
+            self._pending = 0
+
+    def close(self):
+        self.file.close()
+
+
+class RingBufferSink:
+    # Keeps the most recent `size` events in memory.
+    def __init__(self, size=10000):
+        self.events = deque(maxlen=size)
+
+    def write(self, event):
+        self.events.append(event)
+
+    def close(self):
+        pass
+
+
+class Telemetry:
+    # Structured events for the hot paths. A Telemetry without a sink is
+    # disabled: emit() returns immediately and callers that would have to do
+    # extra work to build an event check `enabled` first. bind() returns a
+    # child that adds fixed fields (difficulty, player, ...) to every event.
+    def __init__(self, sink=None, fields=None):
+        self.sink = sink
+        self.enabled = sink is not None
+        self.fields = fields or {}
+
+    def bind(self, **fields):
+        if not self.enabled:
+            return self
+        return Telemetry(self.sink, dict(self.fields, **fields))
+
+    def emit(self, event, **fields):
+        if not self.enabled:
+            return
+        record = {'event': event, 'time': round(time.time(), 3)}
+        record.update(self.fields)
+        record.update(fields)
+        self.sink.write(record)
+
+    def close(self):
+        if self.enabled:
+            self.sink.close()
+
+
+NULL_TELEMETRY = Telemetry()
+
+
+class LatencyHistogram:
+    # Log-spaced buckets (5% wide) so percentiles over any number of samples
+    # take constant memory, with at most ~2.5% relative error.
+    GROWTH = 1.05
+    FLOOR = 1e-6
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        bucket = int(math.log(max(value, self.FLOOR) / self.FLOOR, self.GROWTH))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+
+    def percentile(self, fraction):
+        target = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return self.FLOOR * self.GROWTH ** (bucket + 0.5)
+        return 0.0
+
+
+def read_events(paths):
+    for path in paths:
+        with (sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')) as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def aggregate(events):
+    latencies = {}
+    solves = {}
+    for event in events:
+        kind = event.get('event')
+        if kind == 'answer':
+            key = f"answer[{event.get('difficulty', '?')}]"
+            latencies.setdefault(key, LatencyHistogram()).add(event['elapsed'])
+            for scope in (('difficulty', event.get('difficulty', '?')), ('word', event.get('word', '?'))):
+                attempts = solves.setdefault(scope, [0, 0])
+                attempts[0] += 1
+                attempts[1] += event.get('verdict') == 'correct'
+        elif 'duration' in event:
+            latencies.setdefault(kind, LatencyHistogram()).add(event['duration'])
+    return latencies, solves
+
+
+def print_report(latencies, solves, hardest=10, min_attempts=5):
+    print(f"{'metric':<28}{'count':>10}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for key in sorted(latencies):
+        histogram = latencies[key]
+        unit, scale = ('s', 1) if key.startswith('answer') else ('ms', 1000)
+        row = [histogram.total / histogram.count] + [histogram.percentile(f) for f in (0.50, 0.95, 0.99)]
+        print(f"{key + ' (' + unit + ')':<28}{histogram.count:>10,}" + ''.join(f"{v * scale:>10.2f}" for v in row))
+
+    print(f"\n{'solve rate':<28}{'attempts':>10}{'solved':>10}")
+    for (scope, name), (attempts, solved) in sorted(solves.items()):
+        if scope == 'difficulty':
+            print(f"{name:<28}{attempts:>10,}{solved / attempts:>10.1%}")
+
+    words = [(solved / attempts, attempts, name) for (scope, name), (attempts, solved) in solves.items()
+             if scope == 'word' and attempts >= min_attempts]
+    if words:
+        print(f"\nhardest words (at least {min_attempts} attempts)")
+        for rate, attempts, name in sorted(words)[:hardest]:
+            print(f"  {name:<26}{attempts:>10,}{rate:>10.1%}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarise Word Scramble telemetry logs")
+    commands = parser.add_subparsers(dest='command', required=True)
+    report = commands.add_parser('report', help="latency percentiles and solve rates")
+    report.add_argument('paths', nargs='+', help="JSONL telemetry files ('-' for stdin)")
+    report.add_argument('--hardest', type=int, default=10, help="number of lowest-solve-rate words to list")
+    report.add_argument('--min-attempts', type=int, default=5)
+    args = parser.parse_args()
+
+    latencies, solves = aggregate(read_events(args.paths))
+    print_report(latencies, solves, args.hardest, args.min_attempts)
+
+
+if __name__ == "__main__":
+    main()
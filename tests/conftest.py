@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+# The game's modules live at the top of the repository.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import WordCorpus
+
+# A dictionary small enough to reason about, with anagram groups and an
+# accented word.
+WORDS = ['cat', 'act', 'dog', 'god', 'listen', 'silent', 'enlist', 'python', 'garden', 'danger', 'café']
+
+
+@pytest.fixture
+def corpus():
+    return WordCorpus(WORDS)
@@ -0,0 +1,36 @@
+from adaptive import DEFAULT_RATING, RatingStore
+
+
+def test_two_open_stores_keep_each_others_writes(tmp_path):
+    path = str(tmp_path / 'ratings.db')
+    first, second = RatingStore(path), RatingStore(path)
+    first.set_player('ann', 1500, 3)
+    second.set_player('bob', 1400, 2)
+    first.adjust_word('cat', 5.0)
+    second.adjust_word('cat', -2.0)
+    # Written before either store is closed.
+    assert RatingStore(path).player('ann') == (1500.0, 3)
+    first.close()
+    second.close()
+
+    reopened = RatingStore(path)
+    assert reopened.player('ann') == (1500.0, 3)
+    assert reopened.player('bob') == (1400.0, 2)
+    assert reopened.word_adjustment('cat') == 3.0
+    assert reopened.player('nobody') == (DEFAULT_RATING, 0)
+    reopened.close()
+
+
+def test_legacy_dbm_ratings_are_imported(tmp_path):
+    import dbm
+
+    from adaptive import PLAYER_RECORD, WORD_RECORD
+
+    legacy = str(tmp_path / 'ratings')
+    with dbm.open(legacy, 'c') as db:
+        db[b'p:ann'] = PLAYER_RECORD.pack(1300.0, 4)
+        db[b'w:cat'] = WORD_RECORD.pack(-1.5)
+    store = RatingStore(str(tmp_path / 'ratings.db'), legacy)
+    assert store.player('ann') == (1300.0, 4)
+    assert store.word_adjustment('cat') == -1.5
+    store.close()
@@ -0,0 +1,14 @@
+def test_any_real_anagram_is_accepted(corpus):
+    anagrams = corpus.anagrams
+    assert anagrams.is_anagram('silent', 'listen')
+    assert anagrams.is_anagram('ENLIST', 'listen')
+    assert anagrams.is_anagram('danger', 'garden')
+    assert not anagrams.is_anagram('tinsel', 'listen')
+    assert not anagrams.is_anagram('listens', 'listen')
+    assert not anagrams.is_anagram('', 'listen')
+
+
+def test_anagram_groups(corpus):
+    assert sorted(corpus.anagrams.anagrams('tac')) == ['act', 'cat']
+    assert corpus.anagrams.anagrams('zzz') == ()
+    assert 'python' not in corpus.anagrams.ambiguous
@@ -0,0 +1,51 @@
+import datetime
+
+from daily import daily_board, daily_challenge, load, save, stale_daily_board
+from scores import ALL_BOARD, ScoreStore
+
+
+def entry(name, score, difficulty='daily', **extra):
+    return dict(name=name, score=score, difficulty=difficulty, date='2026-01-01 12:00', **extra)
+
+
+def test_earlier_daily_boards_are_retired(tmp_path):
+    today = datetime.date.today()
+    yesterday = today - datetime.timedelta(days=1)
+    store = ScoreStore(str(tmp_path / 'scores.jsonl'), expired=stale_daily_board)
+    store.record(entry('ann', 40, 'daily', board=daily_board(yesterday)))
+    store.record(entry('bob', 30, 'daily', board=daily_board(today)))
+    assert store.boards() == [ALL_BOARD, 'daily', daily_board(today)]
+    assert store.player_rank('ann', daily_board(yesterday)) is None
+    assert store.player_rank('bob', daily_board(today)) == 1
+
+
+def test_stale_daily_board():
+    today = datetime.date(2026, 3, 10)
+    assert stale_daily_board(daily_board(datetime.date(2026, 3, 9)), today)
+    assert not stale_daily_board(daily_board(today), today)
+    assert not stale_daily_board('easy', today)
+
+
+def test_everyone_gets_the_same_set(tmp_path):
+    from corpus import load_corpus
+
+    corpus = load_corpus()
+    day = datetime.date(2026, 3, 10)
+    path = str(tmp_path / 'daily.bin')
+    challenge = daily_challenge(corpus, day, path)
+    assert daily_challenge(corpus, day, path) is challenge
+    assert load(path, corpus, day, now=0) == challenge
+    save(challenge, corpus, path)
+    assert load(path, corpus, day, now=0).scrambles == challenge.scrambles
+
+
+def test_server_reports_a_stale_daily_board_as_unranked(tmp_path, corpus):
+    from server import ScrambleServer
+
+    today = datetime.date.today()
+    store = ScoreStore(str(tmp_path / 'scores.jsonl'), expired=stale_daily_board)
+    server = ScrambleServer(corpus, {}, store, daily_file=None)
+    ranks = server.commit([entry('ann', 40, board=daily_board(today)),
+                           entry('bob', 50, board=daily_board(today - datetime.timedelta(days=1))),
+                           entry('cy', 10, 'easy')])
+    assert ranks == [1, 0, 3]
@@ -0,0 +1,41 @@
+from engine import GameSession, time_bonus
+
+LEVEL = {'word_count': 3, 'time_limit': 30, 'points': 10, 'min_score': 0, 'max_score': 100}
+
+
+def session_for(corpus, words, level=LEVEL):
+    # Scrambles never affect scoring, so the words stand in for them.
+    return GameSession(corpus, level, list(words), scrambles=list(words))
+
+
+def test_time_bonus():
+    assert time_bonus(30, 0) == 6
+    assert time_bonus(30, 26) == 0
+    assert time_bonus(30, 40) == 0
+
+
+def test_correct_answer_scores_points_and_time_bonus(corpus):
+    session = session_for(corpus, ['python'])
+    verdict = session.submit('python', 4.0)
+    assert verdict.correct and not verdict.timed_out
+    assert (verdict.points, verdict.time_bonus, verdict.round_score) == (10, 5, 15)
+    assert session.score == 15 and session.finished
+
+
+def test_wrong_and_late_answers_score_nothing(corpus):
+    session = session_for(corpus, ['python', 'garden', 'dog'])
+    assert not session.submit('typhon', 1.0).correct
+    late = session.submit('garden', 30.0)
+    assert late.timed_out and late.round_score == 0
+    assert session.submit(None, 2.0).timed_out
+    assert session.score == 0
+
+
+def test_rounds_draw_from_the_level_band(corpus):
+    import random
+
+    session = GameSession(corpus, dict(LEVEL, word_count=4), rng=random.Random(1))
+    assert len(session.words) == 4 and len(set(session.words)) == 4
+    puzzle = session.next_puzzle()
+    assert (puzzle.number, puzzle.total, puzzle.time_limit, puzzle.points) == (1, 4, 30, 10)
+    assert sorted(puzzle.scrambled) == sorted(puzzle.word)
@@ -0,0 +1,36 @@
+from engine import HINT_COSTS, GameSession
+from hints import HintCache
+
+LEVEL = {'word_count': 2, 'time_limit': 30, 'points': 10, 'min_score': 0, 'max_score': 100}
+
+
+def test_hints_come_off_the_word_score(corpus):
+    session = GameSession(corpus, LEVEL, ['python', 'garden'], scrambles=['python', 'garden'])
+    for kind in HINT_COSTS:
+        session.use_hint(kind)
+    assert session.next_hint() is None
+    verdict = session.submit('python', 29.0)
+    assert verdict.hint_cost == sum(HINT_COSTS.values())
+    assert verdict.round_score == 0
+    # Hints are per word.
+    assert session.next_hint() is not None
+    assert session.submit('garden', 29.0).round_score == 10
+
+
+def test_hint_texts(corpus):
+    hints = HintCache(corpus)
+    assert hints.hint('first', 'listen') == "It starts with 'L'"
+    assert hints.hint('letter', 'listen') == "Letter 2 is 'I'"
+    assert hints.hint('anagrams', 'listen') == "3 different words fit these letters"
+    assert hints.hint('anagrams', 'python') == "Only one word fits these letters"
+
+
+def test_hint_cache_keeps_the_most_recent_words(corpus):
+    hints = HintCache(corpus, size=2)
+    for word in ['cat', 'dog', 'cat', 'python']:
+        hints.lookup(word)
+    assert len(hints) == 2 and (hints.hits, hints.misses) == (1, 3)
+    hints.lookup('cat')
+    assert hints.hits == 2
+    hints.lookup('dog')
+    assert hints.misses == 4
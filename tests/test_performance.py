@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# The performance checks run benchmarks.py and rely on its FAIL exit. Their
+# budgets are sized for a desktop; set WORD_SCRAMBLE_BUDGET_SCALE (e.g. 3)
+# on slower machines, or WORD_SCRAMBLE_STARTUP_BUDGET_MS and
+# WORD_SCRAMBLE_PROMPT_BUDGET_MS to set the launch budgets outright.
+BUDGET_SCALE = float(os.environ.get('WORD_SCRAMBLE_BUDGET_SCALE', '1'))
+# import game_gui plus compiling the tiers, in-process.
+STARTUP_BUDGET_MS = float(os.environ.get('WORD_SCRAMBLE_STARTUP_BUDGET_MS', 50 * BUDGET_SCALE))
+# `game_gui.py --fast` from interpreter start to the name prompt.
+PROMPT_BUDGET_MS = float(os.environ.get('WORD_SCRAMBLE_PROMPT_BUDGET_MS', 250 * BUDGET_SCALE))
+# Waiting for an answer may use this share of one core.
+IDLE_CPU_SHARE = 0.01 * BUDGET_SCALE
+IDLE_SECONDS = 2.0
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def benchmark(*args):
+    result = subprocess.run([sys.executable, 'benchmarks.py'] + [str(arg) for arg in args], cwd=ROOT,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=300)
+    assert result.returncode == 0, result.stdout
+    return result.stdout
+
+
+def test_startup_budget():
+    benchmark('startup', '--runs', 3, '--budget', STARTUP_BUDGET_MS)
+
+
+def test_launch_to_first_prompt_budget():
+    benchmark('first-prompt', '--runs', 3, '--budget', PROMPT_BUDGET_MS)
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="needs a pseudo-terminal")
+def test_idle_input_barely_uses_the_cpu():
+    benchmark('idle-input', '--seconds', IDLE_SECONDS, '--max-cpu', IDLE_CPU_SHARE * IDLE_SECONDS)
+
+
+def test_concurrent_score_writers_lose_nothing():
+    benchmark('score-stress', '--processes', 4, '--records', 100, '--batch', 5)
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from engine import GameSession, words_for_round
+from replay import (ANSWER_ENTRIES, GAME_HEADER, LEGACY_LEVELS, REPLAY_MAGIC, ReplayRecorder, decode_replays,
+                    split_replays, verify_replay)
+from tiers import shared_tier, validate_tier
+
+SEED = 1234
+
+
+@pytest.fixture
+def level(corpus):
+    _, tier = validate_tier({'name': 'short', 'word_count': 4, 'time_limit': 20, 'points': 10,
+                             'difficulty': [0, 60]}, 'tier 1')
+    return shared_tier(corpus, 'short', tier)
+
+
+def play(corpus, level, seed=SEED):
+    # A seeded round with a hint, a right, a wrong and a timed-out answer;
+    # returns the session and the answers as the recorder saw them.
+    session = GameSession(corpus, level, words_for_round(corpus, level, random.Random(seed)))
+    answers = []
+    for number in range(session.total):
+        puzzle = session.next_puzzle()
+        if number == 0:
+            session.use_hint(session.next_hint())
+        answer = [puzzle.word, puzzle.word, 'zzz', None][number % 4]
+        elapsed_ms = 1500 + 250 * number
+        answers.append((puzzle.word, answer, elapsed_ms, session.hints_used))
+        session.submit(answer, elapsed_ms / 1000)
+    return session, answers
+
+
+def record(corpus, level, score=None, seed=SEED):
+    session, answers = play(corpus, level, seed)
+    recorder = ReplayRecorder(corpus, 'short', level, seed)
+    for word, answer, elapsed_ms, hints in answers:
+        recorder.add(word, answer, elapsed_ms, hints)
+    return recorder.encode(session.score if score is None else score), session
+
+
+def test_a_recorded_game_verifies(corpus, level):
+    data, session = record(corpus, level)
+    (_, replay), = decode_replays(data)
+    assert replay.seed == SEED and replay.score == session.score > 0
+    assert replay.answers[0][3] == ('first',)
+    assert replay.answers[3][2] is None
+    assert verify_replay(replay, corpus) is None
+
+
+def test_an_inflated_score_is_flagged(corpus, level):
+    data, session = record(corpus, level)
+    tampered, _ = record(corpus, level, score=session.score + 1)
+    (_, honest), (_, cheat) = decode_replays(data + tampered)
+    assert verify_replay(honest, corpus) is None
+    assert "claims" in verify_replay(cheat, corpus)
+
+
+def test_a_different_word_list_is_flagged(corpus, level):
+    from corpus import WordCorpus
+
+    data, _ = record(corpus, level)
+    (_, replay), = decode_replays(data)
+    assert verify_replay(replay, WordCorpus(['other', 'words'])) == "recorded against a different word list"
+
+
+def test_version_2_records_replay_under_their_legacy_level(corpus):
+    difficulty, rules = LEGACY_LEVELS[1]
+    level = shared_tier(corpus, difficulty, rules)
+    session, answers = play(corpus, level)
+    entry = ANSWER_ENTRIES[2]
+    body = b''.join(entry.pack(corpus.index(word), elapsed_ms, len(answer.encode()) if answer is not None else 0xFFFF,
+                               1 if hints else 0) + (answer.encode() if answer is not None else b'')
+                    for word, answer, elapsed_ms, hints in answers)
+    data = GAME_HEADER.pack(REPLAY_MAGIC, 2, 1, corpus.fingerprint(), SEED, session.score, len(answers),
+                            len(body)) + body
+
+    (_, replay), = decode_replays(data)
+    assert (replay.difficulty, replay.level) == ('medium', rules)
+    assert verify_replay(replay, corpus) is None
+
+
+def test_torn_and_foreign_records_are_rejected(corpus, level):
+    data, _ = record(corpus, level)
+    with pytest.raises(ValueError, match="truncated"):
+        list(decode_replays(data + data[:-3]))
+    with pytest.raises(ValueError, match="not a replay record"):
+        list(decode_replays(b'X' + data[1:]))
+    assert [offset for offset, _ in split_replays(data * 5, 2)] == [0, 2 * len(data), 4 * len(data)]
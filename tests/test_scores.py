@@ -0,0 +1,68 @@
+import os
+
+from scores import ALL_BOARD, CHECKPOINT_INTERVAL, ScoreStore, Standings
+
+
+def entry(name, score, difficulty='easy', **extra):
+    return dict(name=name, score=score, difficulty=difficulty, date='2026-01-01 12:00', **extra)
+
+
+def test_record_returns_top_k_ranks(tmp_path):
+    store = ScoreStore(str(tmp_path / 'scores.jsonl'), top_k=3)
+    assert store.record(entry('ann', 50)) == {ALL_BOARD: 1, 'easy': 1}
+    assert store.record(entry('bob', 70, 'hard')) == {ALL_BOARD: 1, 'hard': 1}
+    assert store.record(entry('cy', 60)) == {ALL_BOARD: 2, 'easy': 1}
+    assert store.record(entry('dee', 10)) == {'easy': 3}
+    assert [item['name'] for item in store.top()] == ['bob', 'cy', 'ann']
+
+
+def test_player_rank_uses_each_players_best(tmp_path):
+    store = ScoreStore(str(tmp_path / 'scores.jsonl'))
+    for name, score in [('ann', 50), ('bob', 70), ('ann', 80), ('cy', 70), ('dee', 10)]:
+        store.record(entry(name, score))
+    assert store.player_rank('ann') == 1
+    assert store.player_rank('bob') == store.player_rank('cy') == 2
+    assert store.player_rank('dee') == 4
+    assert store.player_rank('nobody') is None
+    assert store.players() == 4
+    assert store.best('ann') == 80
+
+
+def test_ranks_survive_a_reopen(tmp_path):
+    path = str(tmp_path / 'scores.jsonl')
+    store = ScoreStore(path)
+    for number in range(20):
+        store.record(entry(f"p{number}", number))
+    store.checkpoint()
+    store.record(entry('late', 15))
+    reopened = ScoreStore(path)
+    assert reopened.entries == 21
+    assert reopened.player_rank('late') == store.player_rank('late') == 5
+    assert reopened.top() == store.top()
+
+
+def test_recording_never_writes_the_index(tmp_path):
+    path = str(tmp_path / 'scores.jsonl')
+    store = ScoreStore(path)
+    store.record_many([entry(f"p{number}", number) for number in range(CHECKPOINT_INTERVAL + 1)])
+    assert store.checkpoint_due and not os.path.exists(path + '.index')
+    store.close()
+    assert os.path.exists(path + '.index') and not store.checkpoint_due
+
+
+def test_standings_count_players_ahead():
+    import random
+
+    rng = random.Random(0)
+    standings = Standings()
+    scores = []
+    for _ in range(500):
+        if scores and rng.random() < 0.3:
+            standings.add(scores.pop(rng.randrange(len(scores))), -1)
+        else:
+            # Some far above the initial range, so the tree has to grow.
+            scores.append(rng.choice([rng.randrange(50), rng.randrange(20000)]))
+            standings.add(scores[-1])
+        score = rng.randrange(25000)
+        assert standings.above(score) == sum(other > score for other in scores)
+    assert standings.count == len(scores)
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from server import ScrambleServer
+from tiers import compile_tiers, validate_tier
+
+TIERS = [{'name': 'quick', 'word_count': 2, 'time_limit': 0.3, 'points': 10},
+         {'name': 'slow', 'word_count': 1, 'time_limit': 10, 'points': 10}]
+
+
+class BrokenStore:
+    checkpoint_due = False
+
+    def record_many(self, entries):
+        raise OSError("disk full")
+
+
+@pytest.fixture
+def levels(corpus):
+    return compile_tiers(dict(validate_tier(raw, 'tier') for raw in TIERS), corpus)
+
+
+def play(corpus, levels, client, scores=None):
+    # Runs `client(reader, writer)` against a server on a free local port.
+    async def main():
+        server = ScrambleServer(corpus, levels, scores, daily_file=None)
+        committer = asyncio.ensure_future(server.commit_results())
+        listener = await asyncio.start_server(server.handle_client, '127.0.0.1', 0)
+        reader, writer = await asyncio.open_connection('127.0.0.1', listener.sockets[0].getsockname()[1])
+        try:
+            assert await receive(reader) == ['WELCOME', 'word-scramble', '2']
+            await asyncio.wait_for(client(reader, writer), 10)
+        finally:
+            writer.close()
+            committer.cancel()
+            listener.close()
+            await listener.wait_closed()
+
+    asyncio.run(main())
+
+
+async def receive(reader):
+    return (await reader.readline()).decode().split()
+
+
+def send(writer, line):
+    writer.write(line.encode() + b'\n')
+
+
+def test_a_word_times_out_and_late_answers_are_ignored(corpus, levels):
+    async def client(reader, writer):
+        send(writer, 'PLAY quick ann')
+        assert (await receive(reader))[:3] == ['WORD', '1', '2']
+        timeout = await receive(reader)
+        assert timeout[:2] == ['TIMEOUT', '1'] and timeout[3] == '0'
+        assert (await receive(reader))[:3] == ['WORD', '2', '2']
+        send(writer, f'ANSWER 1 {timeout[2]}')
+        send(writer, 'ANSWER 2 zzz')
+        assert (await receive(reader))[:2] == ['WRONG', '2']
+        assert await receive(reader) == ['END', '0', '0']
+
+    play(corpus, levels, client)
+
+
+def test_hints_run_out(corpus, levels):
+    async def client(reader, writer):
+        send(writer, 'PLAY slow ann')
+        assert (await receive(reader))[:3] == ['WORD', '1', '1']
+        send(writer, 'HINT 2')
+        costs = []
+        for _ in range(4):
+            send(writer, 'HINT 1')
+            reply = await receive(reader)
+            costs.append(reply[2] if reply[0] == 'HINT' else reply)
+        assert costs == ['5', '5', '3', ['NOHINT', '1']]
+        send(writer, 'ANSWER 1 zzz')
+        assert (await receive(reader))[:2] == ['WRONG', '1']
+        assert await receive(reader) == ['END', '0', '0']
+
+    play(corpus, levels, client)
+
+
+def test_over_long_lines_are_dropped(corpus, levels):
+    async def client(reader, writer):
+        send(writer, 'x' * 100000)
+        assert await receive(reader) == ['ERROR', 'line', 'too', 'long']
+        send(writer, 'PLAY slow ann')
+        while (await receive(reader))[0] != 'WORD':
+            # The tail of the long line, if it arrived separately.
+            pass
+        send(writer, 'ANSWER 1 ' + 'x' * 100000)
+        send(writer, 'ANSWER 1 zzz')
+        assert (await receive(reader))[:2] == ['WRONG', '1']
+        assert await receive(reader) == ['END', '0', '0']
+
+    play(corpus, levels, client)
+
+
+def test_a_failed_save_still_ends_the_game(corpus, levels):
+    async def client(reader, writer):
+        for _ in range(2):
+            send(writer, 'PLAY slow ann')
+            assert (await receive(reader))[0] == 'WORD'
+            send(writer, 'ANSWER 1 zzz')
+            assert (await receive(reader))[0] == 'WRONG'
+            assert await receive(reader) == ['END', '0', '0']
+
+    play(corpus, levels, client, BrokenStore())
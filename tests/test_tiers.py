@@ -0,0 +1,72 @@
+import json
+import random
+
+import pytest
+
+from tiers import compile_tier, load_tiers, tier_rules, validate_tier
+
+
+def test_validate_tier_fills_in_defaults():
+    name, tier = validate_tier({'name': 'quick', 'word_count': 5, 'time_limit': 10, 'points': 3,
+                                'length': [3, 4]}, 'tier 1')
+    assert name == 'quick'
+    assert tier['label'] == 'Quick' and tier['color'] == 'WHITE'
+    assert (tier['min_score'], tier['max_score']) == (0, 100)
+    assert (tier['min_length'], tier['max_length']) == (3, 4)
+
+
+@pytest.mark.parametrize('raw, message', [
+    ([], "must be an object"),
+    ({'name': 'x', 'word_count': 5, 'time_limit': 10}, "'points' is required"),
+    ({'name': 'x', 'word_count': 5, 'time_limit': 10, 'points': 1, 'speed': 2}, "unknown key"),
+    ({'name': 'Two Words', 'word_count': 5, 'time_limit': 10, 'points': 1}, "one lower-case word"),
+    ({'name': 'blitz', 'word_count': 5, 'time_limit': 10, 'points': 1}, "reserved"),
+    ({'name': 'x', 'word_count': 0, 'time_limit': 10, 'points': 1}, "'word_count'"),
+    ({'name': 'x', 'word_count': True, 'time_limit': 10, 'points': 1}, "'word_count'"),
+    ({'name': 'x', 'word_count': 5, 'time_limit': 0, 'points': 1}, "'time_limit'"),
+    ({'name': 'x', 'word_count': 5, 'time_limit': 10, 'points': -1}, "'points'"),
+    ({'name': 'x', 'word_count': 5, 'time_limit': 10, 'points': 1, 'difficulty': [60, 30]}, "'difficulty'"),
+    ({'name': 'x', 'word_count': 5, 'time_limit': 10, 'points': 1, 'difficulty': [40, 40]}, "is empty"),
+    ({'name': 'x', 'word_count': 5, 'time_limit': 10, 'points': 1, 'length': [0, 4]}, "'length'"),
+    ({'name': 'x', 'word_count': 5, 'time_limit': 10, 'points': 1, 'color': 'PINK'}, "'color'"),
+])
+def test_validate_tier_rejects(raw, message):
+    with pytest.raises(ValueError, match=message):
+        validate_tier(raw, 'tier 1')
+
+
+def test_load_tiers_rejects_duplicates(tmp_path):
+    path = tmp_path / 'tiers.json'
+    tier = {'name': 'x', 'word_count': 5, 'time_limit': 10, 'points': 1}
+    path.write_text(json.dumps({'tiers': [tier, tier]}))
+    with pytest.raises(ValueError, match="defined twice"):
+        load_tiers(str(path))
+
+
+def test_shipped_tiers_load():
+    assert {'easy', 'medium', 'hard'} <= set(load_tiers())
+
+
+def test_compile_tier_rejects_an_empty_length_band(corpus):
+    _, tier = validate_tier({'name': 'long', 'word_count': 2, 'time_limit': 10, 'points': 1,
+                             'length': [9, 12]}, 'tier 1')
+    with pytest.raises(ValueError, match="matches no words"):
+        compile_tier(corpus, 'long', tier)
+
+
+def test_compile_tier_pads_a_small_band(corpus):
+    _, tier = validate_tier({'name': 'short', 'word_count': 6, 'time_limit': 10, 'points': 1,
+                             'length': [3, 3], 'difficulty': [0, 50]}, 'tier 1')
+    selection = compile_tier(corpus, 'short', tier)['selection']
+    assert len(selection.sample(6, random.Random(0))) == 6
+
+
+def test_tier_rules_round_trip_through_replays(corpus):
+    from replay import ReplayRecorder, decode_replays
+
+    _, tier = validate_tier({'name': 'short', 'word_count': 2, 'time_limit': 7.5, 'points': 4,
+                             'length': [3, 3]}, 'tier 1')
+    recorder = ReplayRecorder(corpus, 'short', tier, seed=1)
+    (_, replay), = decode_replays(recorder.encode(0))
+    assert replay.difficulty == 'short'
+    assert tier_rules(replay.level) == tier_rules(tier)
@@ -0,0 +1,33 @@
+from corpus import WordCorpus, graphemes
+from engine import scramble_word
+from render import display_width
+
+
+def test_anagram_matching_normalizes_case_and_accents(corpus):
+    # A decomposed or upper-case é is the same letter; a plain e is not.
+    assert corpus.anagrams.is_anagram('CAFE\u0301', 'café')
+    assert not corpus.anagrams.is_anagram('cafe', 'café')
+
+
+def test_answers_match_regardless_of_case_folding():
+    corpus = WordCorpus(['straße', 'ÉCOLE'])
+    assert 'école' in list(corpus)
+    assert corpus.anagrams.is_anagram('STRASSE', 'straße')
+    assert corpus.anagrams.is_anagram('École', 'école')
+
+
+def test_scrambles_keep_combining_marks_on_their_letter():
+    import random
+
+    word = 'नमस्ते'
+    corpus = WordCorpus([word])
+    rng = random.Random(3)
+    for _ in range(20):
+        scrambled = scramble_word(word, corpus, rng)
+        assert sorted(graphemes(scrambled)) == sorted(graphemes(word))
+
+
+def test_display_width():
+    assert display_width('word') == 4
+    assert display_width('単語') == 4
+    assert display_width('café') == 4
@@ -0,0 +1,216 @@
+import json
+import os
+from array import array
+
+from difficulty import DifficultyBand
+
+# The fixed-length tiers offered by the game and the server are read from a
+# JSON file:
+#
+#   {"tiers": [
+#       {"name": "easy", "label": "Easy", "title": "EASY MODE - BEGINNER",
+#        "description": "For a relaxed gameplay experience", "color": "GREEN",
+#        "word_count": 10, "time_limit": 60, "points": 10, "difficulty": [0, 30]},
+#       {"name": "sprint", "word_count": 15, "time_limit": 5, "points": 15, "length": [3, 5]}
+#   ]}
+#
+# "difficulty" is a band of difficulty scores (percentiles, 0 = easiest),
+# "length" a band of word lengths in characters; a tier with both draws
+# words that are in both. Only name, word_count, time_limit and points are
+# required. Tiers are offered in file order.
+TIERS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tiers.json')
+
+TIER_KEYS = {'name', 'label', 'title', 'description', 'color', 'word_count', 'time_limit', 'points',
+             'difficulty', 'length'}
+TIER_COLORS = {'RED', 'GREEN', 'YELLOW', 'BLUE', 'MAGENTA', 'CYAN', 'WHITE',
+               'LIGHTRED_EX', 'LIGHTGREEN_EX', 'LIGHTYELLOW_EX', 'LIGHTBLUE_EX', 'LIGHTMAGENTA_EX',
+               'LIGHTCYAN_EX', 'LIGHTWHITE_EX'}
+# Names the game and the score boards already use for other modes.
+RESERVED_NAMES = {'all', 'adaptive', 'blitz', 'daily'}
+# The keys of a validated tier that decide which words a round gets and how
+# it scores (replays store exactly these).
+TIER_RULES = ('word_count', 'time_limit', 'points', 'min_score', 'max_score', 'min_length', 'max_length')
+MAX_WORD_COUNT = 1000
+MAX_POINTS = 10000
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _band(value, where, key, low, high):
+    if (not isinstance(value, list) or len(value) != 2 or not all(map(_is_int, value))
+            or not low <= value[0] <= value[1] <= high):
+        raise ValueError(f"{where}: '{key}' must be [min, max] with {low} <= min <= max <= {high}")
+    return value
+
+
+def validate_tier(raw, where):
+    # Returns the tier as a level dict (the keys GameSession and
+    # words_for_round read, plus how to present it).
+    if not isinstance(raw, dict):
+        raise ValueError(f"{where}: a tier must be an object")
+    unknown = set(raw) - TIER_KEYS
+    if unknown:
+        raise ValueError(f"{where}: unknown key(s) {', '.join(sorted(unknown))}")
+    for key in ('name', 'word_count', 'time_limit', 'points'):
+        if key not in raw:
+            raise ValueError(f"{where}: '{key}' is required")
+
+    name = raw['name']
+    if not isinstance(name, str) or not name or name != name.lower() or len(name.split()) != 1:
+        raise ValueError(f"{where}: 'name' must be one lower-case word")
+    if name in RESERVED_NAMES:
+        raise ValueError(f"{where}: '{name}' is reserved for another game mode")
+    where = f"{where} ('{name}')"
+    if not _is_int(raw['word_count']) or not 1 <= raw['word_count'] <= MAX_WORD_COUNT:
+        raise ValueError(f"{where}: 'word_count' must be an integer from 1 to {MAX_WORD_COUNT}")
+    if not isinstance(raw['time_limit'], (int, float)) or isinstance(raw['time_limit'], bool) \
+            or raw['time_limit'] <= 0:
+        raise ValueError(f"{where}: 'time_limit' must be a positive number of seconds")
+    if not _is_int(raw['points']) or not 0 <= raw['points'] <= MAX_POINTS:
+        raise ValueError(f"{where}: 'points' must be an integer from 0 to {MAX_POINTS}")
+    for key in ('label', 'title', 'description'):
+        if not isinstance(raw.get(key, ''), str):
+            raise ValueError(f"{where}: '{key}' must be a string")
+    color = raw.get('color', 'WHITE')
+    if color not in TIER_COLORS:
+        raise ValueError(f"{where}: 'color' must be one of {', '.join(sorted(TIER_COLORS))}")
+
+    label = raw.get('label') or name.capitalize()
+    min_score, max_score = _band(raw.get('difficulty', [0, 100]), where, 'difficulty', 0, 100)
+    if min_score == max_score:
+        raise ValueError(f"{where}: the 'difficulty' band is empty")
+    tier = {'word_count': raw['word_count'], 'time_limit': raw['time_limit'], 'points': raw['points'],
+            'min_score': min_score, 'max_score': max_score,
+            'label': label, 'title': raw.get('title') or f"{label.upper()} MODE",
+            'description': raw.get('description', ''), 'color': color}
+    if 'length' in raw:
+        tier['min_length'], tier['max_length'] = _band(raw['length'], where, 'length', 1, 255)
+    return name, tier
+
+
+def load_tiers(path=TIERS_FILE):
+    # {name: level} in file order. Raises OSError or ValueError with a
+    # message naming the offending tier.
+    with open(path, 'r', encoding='utf-8') as file:
+        try:
+            config = json.load(file)
+        except ValueError as error:
+            raise ValueError(f"{path}: not valid JSON ({error})")
+    if not isinstance(config, dict) or not isinstance(config.get('tiers'), list) or not config['tiers']:
+        raise ValueError(f"{path}: expected {{\"tiers\": [...]}} with at least one tier")
+    tiers = {}
+    for number, raw in enumerate(config['tiers'], 1):
+        name, tier = validate_tier(raw, f"{path}: tier {number}")
+        if name in tiers:
+            raise ValueError(f"{path}: tier {number}: '{name}' is defined twice")
+        tiers[name] = tier
+    return tiers
+
+
+class WordSelection:
+    # The corpus indices a tier draws from, worked out once. A length band
+    # alone is a contiguous range of the (length-sorted) corpus; combined
+    # with a difficulty band it is the band's slice of the difficulty order,
+    # filtered to that range.
+    #
+    # Like DifficultyBand, a band too small for a round is padded with the
+    # nearest words: the nearest lengths for a length band, the nearest
+    # difficulty (at the tier's lengths, if there are enough) otherwise.
+    def __init__(self, corpus, indices):
+        self.corpus = corpus
+        self.indices = indices
+        self.size = len(indices)
+
+    def sample(self, k, rng):
+        corpus = self.corpus
+        indices = self.indices
+        return [corpus[indices[i]] for i in rng.sample(range(self.size), min(k, self.size))]
+
+
+def widen(start, end, k, limit):
+    # Grow [start, end) evenly on both sides until it holds k of the
+    # positions 0..limit, as DifficultyIndex.sample does.
+    k = min(k, limit)
+    missing = k - (end - start)
+    if missing > 0:
+        start = max(0, start - (missing + 1) // 2)
+        end = min(limit, start + k)
+        start = end - k
+    return start, end
+
+
+def _ranked_band(order, first, last, start, end):
+    # The words with corpus index in [first, last) in difficulty order, and
+    # where the difficulty positions [start, end) fall among them.
+    ranked = array('I')
+    low = high = 0
+    for position, index in enumerate(order):
+        if first <= index < last:
+            low += position < start
+            high += position < end
+            ranked.append(index)
+    return ranked, low, high
+
+
+def compile_tier(corpus, name, tier):
+    if 'min_length' not in tier:
+        return dict(tier, selection=DifficultyBand(corpus.difficulty, tier['min_score'], tier['max_score']))
+
+    k = tier['word_count']
+    first, last = corpus.index_range(tier['min_length'], tier['max_length'])
+    if first == last:
+        raise ValueError(f"tier '{name}' matches no words in the word list")
+    if (tier['min_score'], tier['max_score']) == (0, 100):
+        indices = range(*widen(first, last, k, len(corpus)))
+    else:
+        difficulty = corpus.difficulty
+        start, end = difficulty.position_range(tier['min_score'], tier['max_score'])
+        ranked, low, high = _ranked_band(difficulty.order, first, last, start, end)
+        if len(ranked) < k:
+            first, last = widen(first, last, k, len(corpus))
+            ranked, low, high = _ranked_band(difficulty.order, first, last, start, end)
+        low, high = widen(low, high, k, len(ranked))
+        indices = ranked[low:high]
+    return dict(tier, selection=WordSelection(corpus, indices))
+
+
+def compile_tiers(tiers, corpus):
+    return {name: compile_tier(corpus, name, tier) for name, tier in tiers.items()}
+
+
+def tier_rules(tier):
+    return tuple(tier.get(key) for key in TIER_RULES)
+
+
+_compiled = {}
+
+
+def shared_tier(corpus, name, tier):
+    # compile_tier, done once per process for each word list and set of
+    # rules. Pool workers and replay verification compile the same few
+    # tiers over and over.
+    key = (corpus.fingerprint(), len(corpus), tier_rules(tier))
+    compiled = _compiled.get(key)
+    if compiled is None:
+        compiled = _compiled[key] = compile_tier(corpus, name, tier)
+    return compiled
+
+
+def tier_summary(tier):
+    # Short lines describing a tier, for menus.
+    lines = [f"{tier['word_count']} words", f"{tier['time_limit']:g} seconds per word",
+             f"{tier['points']} points per word"]
+    min_score, max_score = tier['min_score'], tier['max_score']
+    if min_score == 0 and max_score < 100:
+        lines.append(f"Easiest {max_score}% of words")
+    elif max_score == 100 and min_score > 0:
+        lines.append(f"Hardest {100 - min_score}% of words")
+    elif (min_score, max_score) != (0, 100):
+        lines.append(f"Difficulty {min_score}-{max_score}%")
+    if 'min_length' in tier:
+        lengths = (str(tier['min_length']) if tier['min_length'] == tier['max_length']
+                   else f"{tier['min_length']}-{tier['max_length']}")
+        lines.append(f"{lengths} letter words")
+    return lines